@@ -20,15 +20,86 @@ FONT_SCALE_FACTOR = 1 # Riduce le dimensioni del font (0.5 = metà, 1.0 = normal
 RESOLUTION_MODE = 2 # 1 = 1280x1024 forzata, 2 = auto-rilevamento (default)
 # =============================================================================
 
+# =============================================================================
+# CONFIGURAZIONE PRECARICAMENTO CATALOGHI - COMPILA I DAT DI TUTTE LE PIATTAFORME ALL'AVVIO
+# =============================================================================
+PRELOAD_CATALOGS = True  # True = compila in parallelo gli snapshot mancanti mentre è visibile il menu
+PRELOAD_MAX_WORKERS = 0  # Processi paralleli (0 = tutti i core meno uno, riservato al menu a 60 FPS)
+PARSE_WORKERS = 0  # Processi per leggere a blocchi un DAT grande non compresso (0 = automatico, 1 = un solo core)
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE CATALOGHI IN MEMORIA - CAMBIO PIATTAFORMA SENZA RICARICARE
+# =============================================================================
+CATALOG_CACHE_MB = 256  # Memoria stimata massima per i cataloghi in memoria, compreso quello aperto (0 = disattivato)
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE RICERCA APPROSSIMATA - USATA QUANDO NESSUN TITOLO CORRISPONDE ESATTAMENTE
+# =============================================================================
+FUZZY_SEARCH_LIMIT = 50  # Numero massimo di titoli simili mostrati
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE ORDINAMENTO LISTA - IL TASTO O PASSA AL SUCCESSIVO
+# =============================================================================
+SORT_ORDER = "name"  # Ordine iniziale: "name", "description", "year" o "manufacturer"
+SORT_ORDER_LABELS = {'name': "nome ROM", 'description': "titolo", 'year': "anno", 'manufacturer': "produttore"}
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE VISTA PARENT/CLONI - RAGGRUPPA I CLONI SOTTO IL GIOCO ORIGINALE
+# =============================================================================
+GROUP_CLONES = True  # True = la lista mostra solo i parent, i cloni si espandono con C / Select
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE FILTRI - DECENNIO (F5), PRODUTTORE (F6), GENERE (F7), AZZERA (F8)
+# =============================================================================
+CATVER_DEFAULT_PATH = "./dats/catver.ini"  # Generi usato se la piattaforma non ha <catver> in platforms.xml
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE ROM INSTALLATE - SEGNALATE NELLA LISTA GIOCHI
+# =============================================================================
+INSTALLED_POLL_INTERVAL = 5.0  # Secondi tra i controlli della cartella ROM se inotify non è disponibile
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE SALTI NELLA LISTA - SINISTRA/DESTRA PASSANO ALLA LETTERA (O ANNO) SUCCESSIVA
+# =============================================================================
+JUMP_OVERLAY_DURATION = 0.8  # Secondi di visualizzazione della lettera dopo un salto
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE DESCRIZIONI LOCALI - LETTE DAI FILE PRESENTI PRIMA DEL SERVIZIO ONLINE
+# =============================================================================
+HISTORY_DAT_PATHS = ("./dats/history.dat", "./dats/mameinfo.dat", "./dats/command.dat")  # Nell'ordine in cui compongono la descrizione
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE VERIFICA ROM - IL TASTO A CONFRONTA GLI ZIP DI ROMS_PATH CON I CRC DEL DAT
+# =============================================================================
+AUDIT_WORKERS = 0  # Processi che leggono gli zip (0 = tutti i core meno uno, riservato al menu a 60 FPS)
+# =============================================================================
+
+# =============================================================================
+# CONFIGURAZIONE GAMELIST - ALLA CHIUSURA AGGIORNA IL GAMELIST.XML DELLE PIATTAFORME APERTE
+# =============================================================================
+EXPORT_GAMELIST = True  # True = scrive nome, descrizione, anno, produttore e immagini per EmulationStation
+# =============================================================================
+
 import pygame
 import sys
 import os
 import time
 import requests
 import threading
-import xml.etree.ElementTree as ET
 import logging
 import json
+import shutil
+from array import array
+from collections import OrderedDict
 from datetime import datetime
 from io import StringIO
 
@@ -91,6 +162,9 @@ ARCADE_COLORS = {
 # Configurazione schermo - Risoluzione dinamica
 FPS = 60
 
+# Righe della lista giochi già disegnate tenute in memoria (poche schermate di righe visibili)
+LIST_TEXT_CACHE_SIZE = 256
+
 # Funzione per ottenere la risoluzione del monitor
 def get_screen_resolution():
     """Ottiene la risoluzione del monitor principale"""
@@ -172,6 +246,17 @@ from code.platform_menu import PlatformMenu
 from code.joystick_manager import JoystickManager, JoystickConfig
 from code.config_ui import ConfigUI
 from code.game_scraper import GameScraper, ImageDownloader
+from code.catalog_loader import CatalogLoader
+from code.catalog_preloader import CatalogPreloader
+from code.unified_catalog import UNIFIED_SORT_ORDER, compile_unified_catalog, load_unified_catalog
+from code.game_search import CatalogSearchIndex, IncrementalSearch, PrefixIndex, TrigramIndex, get_search_db_path
+from code.game_facets import CatalogFacets
+from code.game_catalog import SORT_ORDERS, get_dat_fingerprint
+from code.rom_index import InstalledRomIndex
+from code.catalog_cache import CatalogCache, CatalogSession
+from code.game_history import GameHistory
+from code.rom_audit import RomAudit
+from code.gamelist_export import GameInfoStore, GamelistExporter
 
 
 class ArcadeUI:
@@ -206,6 +291,26 @@ class ArcadeUI:
         self.image_downloader = ImageDownloader()
         self.joystick_manager = JoystickManager()
         
+        # Precaricamento parallelo dei cataloghi di tutte le piattaforme
+        self.catalog_preloader = None
+        if PRELOAD_CATALOGS:
+            self.catalog_preloader = CatalogPreloader(self.platform_manager.platforms, PRELOAD_MAX_WORKERS)
+            self.catalog_preloader.start()
+        
+        # Descrizioni locali dei giochi, indicizzate in background
+        self.game_history = GameHistory(HISTORY_DAT_PATHS)
+        self.game_history.start()
+        
+        # Catalogo unificato (piattaforme di ogni gioco), caricato dopo l'eventuale precaricamento
+        self.unified_catalog = None
+        self.unified_catalog_state = 'idle'  # 'idle', 'loading', 'done'
+        self.unified_search = None  # Ricerca durante la digitazione nel catalogo unificato (IncrementalSearch)
+        self.unified_search_text = ""  # Testo cercato nella vista unificata
+        self.unified_list = None  # Righe mostrate nella vista unificata, None se da calcolare
+        self.unified_index = 0  # Posizione selezionata nella vista unificata
+        self.unified_jump_index = None  # Sezioni (iniziali dei titoli) della lista unificata
+        self.unified_text_cache = OrderedDict()  # (riga, caratteri, colore) -> testi renderizzati della vista unificata
+        
         # Tracking per tasto INVIO (hold function)
         self.enter_press_time = 0  # Timestamp quando è stato premuto INVIO
         self.enter_held = False    # Flag se INVIO è tenuto premuto
@@ -237,7 +342,32 @@ class ArcadeUI:
         self.selected_item = 0
         self.edit_mode = False
         self.search_text = ""
-        self.games_list = []
+        self.games_list = []  # Indici di riga del catalogo nell'ordine di visualizzazione
+        self.games_list_message = ""  # Messaggio mostrato al posto della lista (errori di caricamento)
+        self.catalog = None  # Catalogo strutturato della piattaforma corrente
+        self.catalog_loader = None  # Caricamento del catalogo in background
+        self.catalog_rows = []  # Lista completa (senza filtro di ricerca) nell'ordine di visualizzazione
+        self.catalog_positions = array('I')  # Riga del catalogo -> posizione in catalog_rows
+        self.parent_rows = array('I')  # Lista dei soli parent (vista raggruppata)
+        self.sort_order = SORT_ORDER if SORT_ORDER in SORT_ORDERS else SORT_ORDERS[0]
+        self.expanded_parents = set()  # Parent con i cloni espansi nella lista
+        self.search_index = None  # Indice di ricerca FTS5 della piattaforma corrente
+        self.trigram_index = None  # Indice a trigrammi per la ricerca approssimata
+        self.facets = None  # Bitmap dei filtri per decennio/produttore/genere (CatalogFacets)
+        self.facet_filter = {}  # Filtri attivi: faccetta -> valore
+        self.facet_values = {}  # Valori disponibili di ogni faccetta, calcolati al primo uso
+        self.installed_roms = None  # ROM già presenti in roms_path (InstalledRomIndex)
+        self.rom_audit = None  # Verifica degli zip di roms_path in corso o appena conclusa (RomAudit)
+        self.game_info_store = None  # Informazioni scaricate della piattaforma corrente (GameInfoStore)
+        self.gamelist_platforms = {}  # Piattaforme aperte in questa sessione, per il gamelist.xml
+        self.catalog_cache = CatalogCache(CATALOG_CACHE_MB * 1024 * 1024)  # Cataloghi delle piattaforme aperte in questa sessione
+        self.catalog_platform = None  # Nome della piattaforma a cui appartiene il catalogo corrente
+        self.catalog_memory_pending = False  # True finché gli indici del catalogo aperto non sono contati nel budget
+        self.jump_index_cache = None  # (lista, ordinamento, JumpIndex) della lista visualizzata, None se da calcolare
+        self.jump_overlay_label = ""  # Lettera/anno mostrato dopo un salto
+        self.jump_overlay_time = 0
+        self.list_text_cache = OrderedDict()  # (riga, prefisso, caratteri, colore) -> testo renderizzato
+        self.list_text_catalog = None  # Catalogo a cui si riferisce list_text_cache
         self.current_game_index = 0
         
         # Sistema di navigazione migliorato
@@ -417,79 +547,408 @@ class ArcadeUI:
             logger.error(f"Errore caricamento sfondo: {e}")
             return None
     
+    def make_catalog_session(self):
+        """Sessione con lo stato della piattaforma corrente: catalogo, indici, viste e filtri"""
+        incremental_search = self.game_scraper.incremental_search
+        return CatalogSession(self.catalog, self.search_index,
+                              incremental_search.index if incremental_search is not None else None,
+                              self.trigram_index, self.facets, self.facet_filter, self.facet_values)
+    
+    def stash_catalog_session(self):
+        """Conserva in memoria il catalogo completo della piattaforma lasciata, con indici e posizione"""
+        if self.catalog_platform is None or self.catalog is None:
+            return
+        selected_row = self.get_selected_row()
+        if selected_row is not None:
+            self.catalog_cache.remember_cursor(self.catalog_platform, self.catalog.names[selected_row])
+        session = self.make_catalog_session()
+        # Il database FTS5 resta aperto nella sessione: non va chiuso qui sotto
+        self.search_index = None
+        self.catalog_cache.put(self.catalog_platform, session)
+    
+    def restore_catalog_session(self, session):
+        """Riprende una piattaforma dalla memoria: lista, indici, filtri e gioco selezionato"""
+        self.catalog = session.catalog
+        self.search_index = session.search_index
+        self.trigram_index = session.trigram_index
+        self.facets = session.facets
+        self.facet_filter = session.facet_filter
+        self.facet_values = session.facet_values
+        self.game_scraper.set_catalog(self.catalog, self.search_index, session.prefix_index, self.trigram_index)
+        # La sessione ripresa conta nel budget: le altre in cache lasciano spazio
+        self.catalog_cache.activate(session)
+        self.set_catalog_view(self.sort_order)
+        self.show_catalog_view()
+        self.select_row_in_list(self.catalog.get_row(self.catalog_cache.get_cursor(self.catalog_platform)))
+        logger.info(f"Catalogo ripreso dalla memoria: {self.catalog_platform} ({len(self.catalog)} giochi)")
+        if self.games_list:
+            self.load_test_images()
+    
     def load_games_list(self):
         """Carica la lista dei giochi dinamicamente dal file XML della piattaforma"""
+        # Il catalogo (e il suo indice) appartiene alla piattaforma precedente
+        if self.catalog_loader is not None:
+            self.catalog_loader.cancel()
+            self.catalog_loader = None
+        else:
+            self.stash_catalog_session()
+        self.catalog_platform = None
+        self.catalog_memory_pending = False
+        if self.search_index is not None:
+            self.search_index.close()
+            self.search_index = None
+        self.trigram_index = None
+        self.facets = None
+        self.facet_filter = {}
+        self.facet_values = {}
+        self.catalog = None
+        self.catalog_rows = []
+        self.catalog_positions = array('I')
+        self.parent_rows = array('I')
+        self.expanded_parents = set()
+        self.games_list = []
+        self.games_list_message = ""
+        self.current_game_index = 0
+        self.search_text = ""
+        self.edit_mode = False
+        self.game_scraper.set_catalog(None)
         try:
             # Controlla se abbiamo un percorso XML per la piattaforma selezionata
-            if hasattr(self, 'platform_paths') and self.platform_paths.get('xml_path'):
-                xml_path = self.platform_paths['xml_path']
-                if os.path.exists(xml_path):
-                    self.games_list = self.load_games_from_xml(xml_path)
-                    return
-            else:
-                    logger.warning(f"File XML non trovato: {xml_path}")
-                    self.games_list = [f"Errore: File XML non trovato - {xml_path}"]
-                    return
+            xml_path = self.platform_paths.get('xml_path') if hasattr(self, 'platform_paths') else None
+            if not xml_path:
+                logger.error("Nessun file XML configurato per questa piattaforma")
+                self.games_list_message = "Errore: Nessun file XML configurato per questa piattaforma"
+                return
             
-            # Se non c'è un percorso XML, mostra errore
-            logger.error("Nessun file XML configurato per questa piattaforma")
-            self.games_list = ["Errore: Nessun file XML configurato per questa piattaforma"]
+            if not os.path.exists(xml_path):
+                logger.warning(f"File XML non trovato: {xml_path}")
+                self.games_list_message = f"Errore: File XML non trovato - {xml_path}"
+                return
+            
+            self.games_list = self.load_games_from_xml(xml_path)
             
         except Exception as e:
             logger.error(f"Errore caricamento lista: {e}")
-            self.games_list = [f"Errore caricamento lista: {e}"]
+            self.games_list_message = f"Errore caricamento lista: {e}"
     
     def load_games_from_xml(self, xml_path):
-        """Carica la lista dei giochi dal file XML MAME"""
-        try:
-            logger.info(f"Caricamento giochi da XML: {xml_path}")
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            
-            games_list = []
-            game_count = 0
-            
-            # Itera attraverso tutti gli elementi <game>
-            for game in root.findall('game'):
-                # Ottieni il nome del gioco (attributo name)
-                game_name = game.get('name', '')
-                
-                # Ottieni la descrizione
-                description_elem = game.find('description')
-                description = description_elem.text if description_elem is not None else game_name
-                
-                # Ottieni l'anno
-                year_elem = game.find('year')
-                year = year_elem.text if year_elem is not None else ''
-                
-                # Ottieni il produttore
-                manufacturer_elem = game.find('manufacturer')
-                manufacturer = manufacturer_elem.text if manufacturer_elem is not None else ''
-                
-                # Tronca la descrizione a 30 caratteri
-                truncated_description = description[:30] + "..." if len(description) > 30 else description
-                
-                # Crea la stringa nel formato: "Nome_rom - Descrizione troncata"
-                game_string = f"{game_name} - {truncated_description}"
-                
-                games_list.append(game_string)
-                game_count += 1
-                
-            
-            
-            # Ordina la lista alfabeticamente per nome del gioco (prima parte prima della virgola)
-            logger.info("Ordinamento alfabetico in corso...")
-            games_list.sort(key=lambda x: x.split(' , ')[0].lower())
-            logger.info("Ordinamento completato")
-            
-            return games_list
+        """Avvia il caricamento del catalogo in background e ritorna le righe già disponibili"""
+        logger.info(f"Caricamento giochi da XML: {xml_path}")
+        
+        # Piattaforma già aperta e DAT invariato: tutto è ancora in memoria
+        self.catalog_platform = self.selected_platform['name']
+        session = self.catalog_cache.get(self.catalog_platform, get_dat_fingerprint(xml_path))
+        if session is not None:
+            self.restore_catalog_session(session)
+            return self.games_list
+        
+        # Il thread usa lo snapshot se valido, altrimenti legge il DAT pubblicando i giochi a blocchi;
+        # a catalogo completo aggiorna anche l'indice di ricerca
+        cache_path = self.platform_paths['cache_path']
+        self.search_index = CatalogSearchIndex(get_search_db_path(cache_path))
+        self.trigram_index = TrigramIndex()
+        self.facets = CatalogFacets(self.platform_paths.get('catver_path') or CATVER_DEFAULT_PATH)
+        # Ordine: prima gli indici in memoria usati subito dall'interfaccia, poi il database FTS5
+        self.catalog_loader = CatalogLoader(xml_path, cache_path,
+                                            (self.trigram_index, self.facets, self.search_index),
+                                            PARSE_WORKERS)
+        self.catalog_loader.start()
+        self.catalog = self.catalog_loader.catalog
+        return range(0)
+    
+    def update_catalog_loading(self):
+        """Aggiorna la lista giochi con i blocchi pubblicati dal caricamento in background"""
+        loader = self.catalog_loader
+        if loader is None:
+            return
+        
+        self.catalog = loader.catalog
+        if loader.state == 'loading':
+            # Durante la lettura del DAT le righe sono mostrate nell'ordine del file
+            if len(self.games_list) != loader.published_count:
+                self.games_list = range(loader.published_count)
+        elif loader.state == 'done':
+            # Lista completa e ordinata: mantieni selezionato lo stesso gioco
+            selected_row = self.get_selected_row() if self.current_game_index > 0 else None
+            if selected_row is None:
+                # Piattaforma già aperta in passato: torna sul gioco selezionato allora
+                selected_row = self.catalog.get_row(self.catalog_cache.get_cursor(self.catalog_platform))
+            self.catalog_loader = None
+            self.game_scraper.set_catalog(self.catalog, self.search_index, loader.prefix_index, self.trigram_index)
+            # Il catalogo aperto conta nel budget dei cataloghi in memoria; gli indici
+            # ancora in costruzione sono contati quando pronti (update_catalog_memory)
+            self.catalog_cache.activate(self.make_catalog_session())
+            self.catalog_memory_pending = True
+            self.set_catalog_view(self.sort_order)
+            if self.search_text.strip():
+                # Testo scritto durante il caricamento: la lista mostra i suoi risultati
+                self.search_games_incremental()
+            else:
+                self.show_catalog_view()
+            self.select_row_in_list(selected_row)
+            logger.info(f"Lista giochi pronta: {len(self.games_list)} giochi")
+            if loader.delta is not None:
+                self.show_toast(f"DAT aggiornato: {loader.delta.summary()}", 5.0)
             
-        except ET.ParseError as e:
-            logger.error(f"Errore parsing XML: {e}")
-            return []
+            # Carica immagini di test per il primo gioco
+            if self.games_list:
+                self.load_test_images()
+        elif loader.state == 'error':
+            self.games_list = []
+            self.games_list_message = loader.error_message
+            self.catalog_loader = None
+            # Catalogo incompleto: non va conservato in memoria
+            self.catalog_platform = None
+    
+    def update_catalog_memory(self):
+        """Ricalcola il budget dei cataloghi in memoria quando gli indici del catalogo aperto sono completi"""
+        if not self.catalog_memory_pending:
+            return
+        for index in (self.trigram_index, self.facets):
+            if index is not None and not index.ready:
+                return
+        self.catalog_memory_pending = False
+        self.catalog_cache.trim()
+    
+    def update_unified_catalog(self):
+        """Avvia la lettura del catalogo unificato (dopo il precaricamento, se attivo) e prepara la sua lista"""
+        if self.unified_catalog_state == 'done':
+            if self.unified_list is None and self.unified_catalog is not None:
+                self.search_unified()
+            return
+        if self.unified_catalog_state != 'idle':
+            return
+        if self.catalog_preloader is not None:
+            if self.catalog_preloader.state != 'done':
+                return
+            # Snapshot ricompilati: il numero di giochi delle piattaforme va riletto
+            self.platform_manager.invalidate_derived()
+        
+        self.unified_catalog_state = 'loading'
+        thread = threading.Thread(target=self._load_unified_catalog_worker)
+        thread.daemon = True
+        thread.start()
+    
+    def _load_unified_catalog_worker(self):
+        """Worker thread per la lettura (o, senza precaricamento, la compilazione) del catalogo unificato"""
+        platforms = self.platform_manager.platforms
+        try:
+            catalog = load_unified_catalog(platforms)
+            if catalog is None and self.catalog_preloader is None:
+                # Nessun precaricamento: lo snapshot mancante o obsoleto si compila qui, dagli snapshot delle piattaforme
+                count, elapsed = compile_unified_catalog(platforms)
+                logger.info(f"Catalogo unificato compilato: {count} giochi in {elapsed:.1f}s")
+                catalog = load_unified_catalog(platforms)
+            if catalog is not None:
+                # Vista e indice di ricerca pronti prima di pubblicare il catalogo al loop pygame
+                catalog.get_view(UNIFIED_SORT_ORDER)
+                self.unified_search = IncrementalSearch(PrefixIndex(catalog))
+                self.unified_catalog = catalog
+                logger.info(f"Catalogo unificato pronto: {len(catalog)} giochi distinti")
         except Exception as e:
-            logger.error(f"Errore caricamento XML: {e}")
+            logger.warning(f"Errore caricamento catalogo unificato: {e}")
+        finally:
+            self.unified_catalog_state = 'done'
+    
+    def start_rom_audit(self):
+        """Avvia la verifica degli zip di roms_path rispetto al catalogo della piattaforma corrente"""
+        if self.rom_audit is not None and self.rom_audit.state == 'running':
+            self.show_toast("Verifica ROM già in corso", 2.0)
+            return
+        if self.catalog is None or self.catalog_loader is not None:
+            self.show_toast("Attendi il caricamento della lista giochi", 2.0)
+            return
+        roms_path = self.platform_paths.get('roms_path') if hasattr(self, 'platform_paths') else None
+        if not roms_path or not os.path.isdir(roms_path):
+            self.show_toast("Cartella ROM non presente", 3.0)
+            return
+        
+        self.rom_audit = RomAudit(roms_path, self.platform_paths['cache_path'], self.catalog, AUDIT_WORKERS)
+        self.rom_audit.start()
+        self.show_toast("Verifica ROM in corso...", 2.0)
+    
+    def update_rom_audit(self):
+        """Mostra l'avanzamento e poi l'esito della verifica ROM"""
+        audit = self.rom_audit
+        if audit is None:
+            return
+        if audit.state == 'running':
+            message = f"Verifica ROM: {audit.progress}/{audit.total} zip letti"
+            if audit.total and message != self.toast_message:
+                self.show_toast(message, 1.0)
+        elif audit.state == 'done':
+            self.show_toast(f"Verifica ROM: {audit.summary()}", 8.0)
+            self.rom_audit = None
+        elif audit.state == 'error':
+            self.show_toast(f"Errore verifica ROM: {audit.error_message}", 5.0)
+            self.rom_audit = None
+    
+    def get_game_platforms(self, rom_name):
+        """Nomi delle piattaforme che contengono il gioco (dal catalogo unificato), lista vuota se non disponibile"""
+        unified = self.unified_catalog
+        platforms = self.platform_manager.platforms
+        if unified is None or self.selected_platform not in platforms:
+            return []
+        row = unified.find_row(platforms.index(self.selected_platform), rom_name)
+        if row is None:
             return []
+        return [platforms[index]['name'] for index in unified.get_platform_indexes(row) if index < len(platforms)]
+    
+    def get_unified_platforms(self, row):
+        """Indici delle piattaforme configurate che contengono una riga del catalogo unificato"""
+        platform_count = len(self.platform_manager.platforms)
+        return [index for index in self.unified_catalog.get_platform_indexes(row) if index < platform_count]
+    
+    def open_unified_screen(self):
+        """Mostra la vista unificata: tutti i giochi di tutte le piattaforme, con le piattaforme di ognuno"""
+        self.current_screen = 'unified'
+        logger.info("Vista unificata di tutte le piattaforme")
+        if self.unified_catalog_state != 'done':
+            self.show_toast("Catalogo unificato in preparazione...", 2.0)
+    
+    def search_unified(self):
+        """Lista della vista unificata: tutti i giochi per titolo, o solo quelli che contengono le parole cercate"""
+        unified = self.unified_catalog
+        self.unified_index = 0
+        if unified is None:
+            return
+        rows, _, positions = unified.get_view(UNIFIED_SORT_ORDER)
+        jump_index = unified.get_jump_index(UNIFIED_SORT_ORDER)
+        if not self.unified_search_text.strip():
+            self.unified_list = rows
+            self.unified_jump_index = jump_index
+            return
+        results = self.unified_search.search(self.unified_search_text)
+        if len(results) > len(rows) // 8:
+            # Molti risultati: un passaggio sulla lista completa costa meno dell'ordinamento
+            self.unified_list = array('I', [row for row in rows if row in results])
+        else:
+            self.unified_list = array('I', sorted(results, key=positions.__getitem__))
+        self.unified_jump_index = jump_index.select(self.unified_list, positions.__getitem__)
+    
+    def move_unified_selection(self, new_index):
+        """Sposta la selezione della vista unificata entro i limiti della lista"""
+        if self.unified_list:
+            self.unified_index = max(0, min(len(self.unified_list) - 1, new_index))
+    
+    def handle_unified_action(self, action):
+        """Azioni (joystick o tastiera) nella vista unificata"""
+        if action in ('back', 'toggle_clones'):
+            self.current_screen = 'menu'
+        elif action == 'up':
+            self.move_unified_selection(self.unified_index - 1)
+        elif action == 'down':
+            self.move_unified_selection(self.unified_index + 1)
+        elif action in ('fast_scroll_up', 'scroll_up'):
+            self.move_unified_selection(self.unified_index - 20)
+        elif action in ('fast_scroll_down', 'scroll_down'):
+            self.move_unified_selection(self.unified_index + 20)
+        elif action in ('left', 'right') and self.unified_list and self.unified_jump_index is not None:
+            if action == 'left':
+                new_index = self.unified_jump_index.previous_position(self.unified_index)
+            else:
+                new_index = self.unified_jump_index.next_position(self.unified_index)
+            if new_index is not None:
+                self.unified_index = new_index
+                self.jump_overlay_label = self.unified_jump_index.get_label(new_index)
+                self.jump_overlay_time = time.time()
+        elif action in ('confirm', 'confirm_hold'):
+            self.open_unified_game()
+    
+    def _handle_unified_keyboard(self, event):
+        """Tasti della vista unificata: il testo scritto filtra la lista, Invio apre il gioco"""
+        if event.key == pygame.K_ESCAPE:
+            self.current_screen = 'menu'
+        elif event.key == pygame.K_BACKSPACE:
+            if self.unified_search_text:
+                self.unified_search_text = self.unified_search_text[:-1]
+                self.search_unified()
+            else:
+                self.current_screen = 'menu'
+        elif event.key == pygame.K_RETURN:
+            self.open_unified_game()
+        elif event.key == pygame.K_UP:
+            self.handle_unified_action('up')
+        elif event.key == pygame.K_DOWN:
+            self.handle_unified_action('down')
+        elif event.key == pygame.K_LEFT:
+            self.handle_unified_action('left')
+        elif event.key == pygame.K_RIGHT:
+            self.handle_unified_action('right')
+        elif event.key == pygame.K_PAGEUP:
+            self.handle_unified_action('scroll_up')
+        elif event.key == pygame.K_PAGEDOWN:
+            self.handle_unified_action('scroll_down')
+        elif event.key == pygame.K_F11:
+            self.toggle_fullscreen()
+        elif event.unicode and event.unicode.isprintable():
+            self.unified_search_text += event.unicode
+            self.search_unified()
+    
+    def open_unified_game(self):
+        """Apre il gioco selezionato nella sua piattaforma (quella corrente se lo contiene, altrimenti la prima)"""
+        if not self.unified_list or self.unified_catalog is None:
+            return
+        row = self.unified_list[self.unified_index]
+        platform_indexes = self.get_unified_platforms(row)
+        if not platform_indexes:
+            return
+        platforms = self.platform_manager.platforms
+        platform_index = platform_indexes[0]
+        if self.selected_platform in platforms and platforms.index(self.selected_platform) in platform_indexes:
+            platform_index = platforms.index(self.selected_platform)
+        platform = platforms[platform_index]
+        rom_name = self.unified_catalog.get_platform_rom_name(row, platform_index)
+        
+        self.select_platform(platform)
+        if self.catalog_loader is None and self.catalog is not None:
+            # Catalogo ripreso dalla memoria: la lista è già pronta
+            self.select_row_in_list(self.catalog.get_row(rom_name))
+        else:
+            # Il caricamento selezionerà il gioco a lista pronta
+            self.catalog_cache.remember_cursor(platform['name'], rom_name)
+    
+    def set_catalog_view(self, order):
+        """Usa la vista di un ordinamento, precalcolata dal thread di caricamento o letta dallo snapshot"""
+        self.catalog_rows, self.parent_rows, self.catalog_positions = self.catalog.get_view(order)
+        self.sort_order = order
+    
+    def cycle_sort_order(self):
+        """Passa all'ordinamento successivo mantenendo selezionato lo stesso gioco"""
+        if self.catalog is None or self.catalog_loader is not None:
+            return
+        
+        selected_row = self.get_selected_row()
+        order = SORT_ORDERS[(SORT_ORDERS.index(self.sort_order) + 1) % len(SORT_ORDERS)]
+        self.set_catalog_view(order)
+        if self.search_text.strip():
+            # Risultati di ricerca: riordina solo quelli
+            self.games_list = array('I', sorted(self.games_list, key=self.catalog_positions.__getitem__))
+            self.select_jump_index()
+        else:
+            self.show_catalog_view()
+        self.select_row_in_list(selected_row)
+        print(f"🔃 Ordinamento: {SORT_ORDER_LABELS[order]}")
+    
+    def select_row_in_list(self, row):
+        """Sposta la selezione su una riga; un clone non visibile diventa il suo parent"""
+        self.current_game_index = 0
+        if row is None:
+            return
+        if self.is_grouped_view():
+            parent_row = self.catalog.get_parent_row(row)
+            if parent_row is not None and parent_row not in self.expanded_parents:
+                row = parent_row
+        try:
+            self.current_game_index = self.games_list.index(row)
+        except ValueError:
+            pass  # Riga esclusa dai filtri attivi
+    
+    def get_selected_row(self):
+        """Ritorna la riga del catalogo del gioco selezionato, None se non disponibile"""
+        if self.catalog is None or not (0 <= self.current_game_index < len(self.games_list)):
+            return None
+        return self.games_list[self.current_game_index]
     
     def load_test_images(self):
         """Carica immagini di test per dimostrare il funzionamento"""
@@ -503,19 +962,16 @@ class ArcadeUI:
             }
             
             # Carica anche le informazioni di test
-            if self.games_list:
-                game_text = self.games_list[0]
-                # Nuovo formato: "Nome_rom - Descrizione troncata (anno, produttore)"
-                parts = game_text.split(' - ', maxsplit=1)
-                if len(parts) >= 2:
-                    rom_name = parts[0].strip()
-                    description_part = parts[1].strip()
+            if self.games_list and self.catalog is not None:
+                record = self.catalog.get_record(self.games_list[0])
+                rom_name = record['name']
+                if rom_name:
                     self.game_info = {
-                        'name': description_part,
+                        'name': record['description'],
                         'rom_name': rom_name,
                         'description': f"Descrizione per {rom_name}. Gioco arcade classico con gameplay coinvolgente e grafiche caratteristiche dell'epoca.",
-                        'year': "1980-1990",
-                        'manufacturer': "Arcade Manufacturer"
+                        'year': record['year'] or "1980-1990",
+                        'manufacturer': record['manufacturer'] or "Arcade Manufacturer"
                     }
                     
                     # Prepara le righe della descrizione per lo scroll
@@ -750,6 +1206,16 @@ class ArcadeUI:
                 self.current_screen = 'menu'
             return
         
+        # Vista unificata: ricerca e lista di tutte le piattaforme
+        if self.current_screen == 'unified':
+            self._handle_unified_keyboard(event)
+            return
+        
+        # Modalità scrittura: i tasti compongono il testo di ricerca
+        if self.edit_mode and self.current_screen == 'main':
+            self._handle_search_keyboard(event)
+            return
+        
         # Gestisci conferma download ROM
         if self.download_confirmation_active:
             # Se è in stato di risultato, qualsiasi tasto chiude
@@ -820,6 +1286,9 @@ class ArcadeUI:
                 self.enter_press_time = time.time()
                 self.enter_held = False
                 # Non processare immediatamente, aspetta il rilascio
+            elif event.key == pygame.K_u:
+                # U per la vista unificata di tutte le piattaforme
+                self.open_unified_screen()
         else:
             # Gestisci input nella schermata principale
             if event.key == pygame.K_UP:
@@ -837,6 +1306,27 @@ class ArcadeUI:
                 # Non processare immediatamente, aspetta il rilascio
             elif event.key == pygame.K_SPACE:
                 self.alternative_action()
+            elif event.key == pygame.K_c:
+                # C per espandere/chiudere i cloni del gioco selezionato
+                self.toggle_clones()
+            elif event.key == pygame.K_o:
+                # O per cambiare l'ordinamento della lista
+                self.cycle_sort_order()
+            elif event.key == pygame.K_a:
+                # A per verificare le ROM della cartella con i CRC del DAT
+                self.start_rom_audit()
+            elif event.key == pygame.K_F5:
+                self.cycle_facet_filter('decade')
+            elif event.key == pygame.K_F6:
+                self.cycle_facet_filter('manufacturer')
+            elif event.key == pygame.K_F7:
+                self.cycle_facet_filter('genre')
+            elif event.key == pygame.K_F8:
+                self.clear_facet_filter()
+            elif event.key in (pygame.K_SLASH, pygame.K_F3):
+                # / o F3 per scrivere il testo di ricerca
+                self.edit_mode = True
+                print("📝 Modalità scrittura attivata")
             elif event.key == pygame.K_l:
                 # L per cambiare sezione a sinistra
                 self.current_section_index = (self.current_section_index - 1) % len(self.sections)
@@ -866,6 +1356,14 @@ class ArcadeUI:
                 self.current_screen = 'menu'
             return
         
+        # Vista unificata: Select o Pulsante 2 tornano al menu
+        if self.current_screen == 'unified':
+            if action == 'quit_app':
+                print("👋 Chiusura applicazione...")
+                return False
+            self.handle_unified_action(action)
+            return True
+        
         # Gestisci conferma download ROM
         if self.download_confirmation_active:
             # Se è in stato di risultato, qualsiasi pulsante chiude
@@ -911,6 +1409,9 @@ class ArcadeUI:
                 result = self.platform_menu.handle_input('confirm_hold')
                 if result:
                     self._handle_joystick_action(result)
+            elif action == 'toggle_clones':
+                # Select nel menu apre la vista unificata di tutte le piattaforme
+                self.open_unified_screen()
             else:
                 selected_platform = self.platform_menu.handle_input(action)
                 if selected_platform:
@@ -945,6 +1446,9 @@ class ArcadeUI:
             elif action == 'search_info':
                 # B del joystick - download ROM
                 self.download_rom()
+            elif action == 'toggle_clones':
+                # Select - espande/chiude i cloni del gioco selezionato
+                self.toggle_clones()
             elif action == 'fast_scroll_up':
                 self.fast_scroll_up()
             elif action == 'fast_scroll_down':
@@ -966,13 +1470,20 @@ class ArcadeUI:
         
         # Aggiorna i percorsi dinamici per questa piattaforma
         self.update_platform_paths(platform)
-        
-        # Carica la lista giochi per questa piattaforma
+        if self.game_info_store is not None:
+            self.game_info_store.save()
+        self.game_info_store = GameInfoStore(platform['path'])
+        self.gamelist_platforms[platform['name']] = platform
+        
+        # Una sola scansione della cartella ROM, poi aggiornamenti da inotify/polling
+        if self.installed_roms is not None:
+            self.installed_roms.stop()
+        self.installed_roms = InstalledRomIndex(platform['roms_path'], INSTALLED_POLL_INTERVAL)
+        self.installed_roms.start()
+        
+        # Avvia il caricamento della lista giochi per questa piattaforma
+        # (le immagini di test vengono caricate a catalogo completo)
         self.load_games_list()
-        
-        # Carica immagini di test per il primo gioco
-        if self.games_list:
-            self.load_test_images()
     
     def update_platform_paths(self, platform):
         """Aggiorna i percorsi dinamici basati sulla piattaforma selezionata"""
@@ -981,10 +1492,8 @@ class ArcadeUI:
             'cache_path': platform['path'],
             'roms_path': platform['roms_path'],
             'xml_path': platform['xml'],
-            'ingame_url': platform['ingame'],
-            'title_url': platform['title'],
-            'info_url': platform['info'],
-            'rom_url': platform['rom']
+            'rom_url': platform['rom'],
+            'catver_path': platform.get('catver', '')
         }
         logger.info(f"Percorsi aggiornati per: {platform['name']}")
         logger.debug(f"Cache: {platform['path']}")
@@ -1030,21 +1539,52 @@ class ArcadeUI:
                 self.description_scroll += 1
                 print(f"📜 Scroll descrizione: {self.description_scroll}")
     
+    def get_jump_index(self):
+        """Indice delle sezioni (lettere o anni) della lista visualizzata.
+
+        Le viste del catalogo usano l'indice precalcolato e le sottoliste nello
+        stesso ordine (filtri, ricerca incrementale) ne derivano uno con
+        select_jump_index(); chi modifica games_list sul posto (toggle_clones)
+        sposta le sezioni con JumpIndex.shifted(). Solo le liste in un altro
+        ordine (risultati per pertinenza, caricamento in corso) si scorrono qui.
+        """
+        games_list = self.games_list
+        cached = self.jump_index_cache
+        if cached is not None and cached[0] is games_list and cached[1] == self.sort_order:
+            return cached[2]
+        jump_index = self.catalog.build_jump_index(games_list, self.sort_order)
+        self.set_jump_index(jump_index)
+        return jump_index
+    
+    def set_jump_index(self, jump_index):
+        """Associa l'indice delle sezioni alla lista visualizzata"""
+        self.jump_index_cache = (self.games_list, self.sort_order, jump_index)
+    
+    def select_jump_index(self):
+        """Sezioni di una sottolista nell'ordine della vista, dall'indice precalcolato del catalogo"""
+        jump_index = self.catalog.get_jump_index(self.sort_order)
+        self.set_jump_index(jump_index.select(self.games_list, self.catalog_positions.__getitem__))
+    
+    def jump_to_position(self, new_index):
+        """Sposta la selezione all'inizio di una sezione e mostra la sua lettera"""
+        self.current_game_index = new_index
+        self.jump_overlay_label = self.get_jump_index().get_label(new_index)
+        self.jump_overlay_time = time.time()
+        print(f"🔤 Salto a {self.jump_overlay_label}: posizione {self.current_game_index}/{len(self.games_list)-1}")
+    
     def navigate_left(self):
-        """Naviga verso sinistra - salta 40 righe indietro nella lista"""
-        if self.current_section_index == 0:  # Se siamo nella lista, saltiamo 40 righe indietro
-            new_index = max(0, self.current_game_index - 40)
-            if new_index != self.current_game_index:
-                self.current_game_index = new_index
-                print(f"⏫ Salto di 40 righe indietro: posizione {self.current_game_index}/{len(self.games_list)-1}")
+        """Naviga verso sinistra - salta all'inizio della lettera (o anno) corrente o precedente"""
+        if self.current_section_index == 0 and self.games_list and self.catalog is not None:
+            new_index = self.get_jump_index().previous_position(self.current_game_index)
+            if new_index is not None:
+                self.jump_to_position(new_index)
     
     def navigate_right(self):
-        """Naviga verso destra - salta 40 righe nella lista"""
-        if self.current_section_index == 0:  # Se siamo nella lista, saltiamo 40 righe
-            new_index = min(len(self.games_list) - 1, self.current_game_index + 40)
-            if new_index != self.current_game_index:
-                self.current_game_index = new_index
-                print(f"⏬ Salto di 40 righe: posizione {self.current_game_index}/{len(self.games_list)-1}")
+        """Naviga verso destra - salta all'inizio della lettera (o anno) successiva"""
+        if self.current_section_index == 0 and self.games_list and self.catalog is not None:
+            new_index = self.get_jump_index().next_position(self.current_game_index)
+            if new_index is not None:
+                self.jump_to_position(new_index)
     
     def fast_scroll_up(self):
         """Scorrimento veloce verso l'alto - salta sempre 20 righe per D-pad"""
@@ -1120,50 +1660,192 @@ class ArcadeUI:
     
     def select_game(self):
         """Seleziona un gioco dalla lista"""
-        if self.current_game_index < len(self.games_list):
-            game_name = self.games_list[self.current_game_index]
-            logger.info(f"Gioco selezionato: {game_name}")
+        row = self.get_selected_row()
+        if row is not None:
+            logger.info(f"Gioco selezionato: {self.catalog.display_text(row)}")
             # Cerca automaticamente le informazioni quando si seleziona un gioco
             self.search_game_info()
     
     def search_games(self):
-        """Cerca giochi"""
+        """Cerca giochi nel catalogo e mostra i risultati nella lista"""
+        if self.catalog is None or self.catalog_loader is not None:
+            return
+        
+        if self.search_text.strip():
+            results = self.game_scraper.search_games(self.search_text)
+            if not results:
+                # Nessun titolo esatto: prova la ricerca approssimata (errori di battitura)
+                results = self.game_scraper.search_games(self.search_text, FUZZY_SEARCH_LIMIT, fuzzy=True)
+            self.games_list = array('I', results)
+            print(f"🔍 Ricerca: {self.search_text} ({len(results)} risultati)")
+        else:
+            # Ricerca vuota: torna alla lista completa
+            self.show_catalog_view()
+        self.current_game_index = 0
+    
+    def search_games_incremental(self):
+        """Filtra la lista a ogni tasto premuto, mantenendo l'ordine della lista completa"""
+        if self.catalog is None or self.catalog_loader is not None:
+            return
+        
         if self.search_text.strip():
-            print(f"🔍 Ricerca: {self.search_text}")
-            # Qui implementeresti la logica di ricerca
+            results = self.game_scraper.search_games_incremental(self.search_text)
+            if not results:
+                # Nessun prefisso corrisponde: titoli simili, dal più somigliante
+                self.games_list = array('I', self.game_scraper.search_games(self.search_text, FUZZY_SEARCH_LIMIT, fuzzy=True))
+            else:
+                if len(results) > len(self.catalog_rows) // 8:
+                    # Molti risultati: un passaggio sulla lista completa costa meno dell'ordinamento
+                    self.games_list = array('I', [row for row in self.catalog_rows if row in results])
+                else:
+                    self.games_list = array('I', sorted(results, key=self.catalog_positions.__getitem__))
+                self.select_jump_index()
+        else:
+            self.show_catalog_view()
+        self.current_game_index = 0
+    
+    def is_grouped_view(self):
+        """True se la lista mostra il catalogo raggruppato per parent (nessuna ricerca attiva)"""
+        return GROUP_CLONES and self.catalog_loader is None and not self.search_text.strip()
+    
+    def show_catalog_view(self):
+        """Mostra il catalogo completo: solo parent con i cloni chiusi, oppure tutte le righe"""
+        self.expanded_parents.clear()
+        rows = self.parent_rows if GROUP_CLONES else self.catalog_rows
+        if self.facet_filter and self.facets is not None and self.facets.ready:
+            # Filtri attivi: AND delle bitmap (senza cloni nella vista raggruppata),
+            # poi le sole righe selezionate nell'ordine della lista
+            mask = self.facets.filter(clones=not GROUP_CLONES, **self.facet_filter)
+            self.games_list = self.facets.select(mask, rows, self.catalog_positions)
+            self.select_jump_index()
+        elif GROUP_CLONES:
+            # Copia: espandere i cloni modifica la lista mostrata, non quella dei parent
+            self.games_list = array('I', self.parent_rows)
+            self.set_jump_index(self.catalog.get_jump_index(self.sort_order, parents=True))
+        else:
+            self.games_list = self.catalog_rows
+            self.set_jump_index(self.catalog.get_jump_index(self.sort_order))
+    
+    def cycle_facet_filter(self, facet):
+        """Passa al valore successivo di un filtro (dopo l'ultimo il filtro si disattiva)"""
+        if self.catalog_loader is not None or self.facets is None or not self.facets.ready:
+            print("⏳ Filtri non ancora disponibili")
+            return
+        
+        values = self.facet_values.get(facet)
+        if values is None:
+            values = self.facet_values[facet] = self.facets.get_values(facet)
+        current = self.facet_filter.get(facet)
+        next_index = values.index(current) + 1 if current in values else 0
+        if next_index < len(values):
+            self.facet_filter[facet] = values[next_index]
+        else:
+            self.facet_filter.pop(facet, None)
+        self.apply_facet_filter()
+    
+    def clear_facet_filter(self):
+        """Disattiva tutti i filtri"""
+        if self.facet_filter:
+            self.facet_filter.clear()
+            self.apply_facet_filter()
+    
+    def apply_facet_filter(self):
+        """Mostra il catalogo filtrato (i filtri si applicano alla lista completa, non alla ricerca)"""
+        self.search_text = ""
+        self.show_catalog_view()
+        self.current_game_index = 0
+        self.games_list_message = "Nessun gioco corrisponde ai filtri" if not self.games_list else ""
+        print(f"🔎 Filtri: {self.get_facet_filter_label() or 'nessuno'} ({len(self.games_list)} giochi)")
+    
+    def get_facet_filter_label(self):
+        """Testo dei filtri attivi per il titolo della lista"""
+        return " · ".join(self.facet_filter[facet] for facet in ('decade', 'manufacturer', 'genre')
+                          if facet in self.facet_filter)
+    
+    def get_visible_clones(self, parent_row):
+        """Cloni di un parent da mostrare: solo quelli dei filtri attivi, nell'ordinamento corrente"""
+        clones = self.catalog.clones.get(parent_row)
+        if not clones:
+            return array('I')
+        if self.facet_filter and self.facets is not None and self.facets.ready:
+            mask = self.facets.filter(**self.facet_filter)
+            clones = [row for row in clones if mask >> row & 1]
+        return array('I', sorted(clones, key=self.catalog_positions.__getitem__))
+    
+    def toggle_clones(self):
+        """Espande o richiude i cloni del gioco selezionato nella vista raggruppata"""
+        row = self.get_selected_row()
+        if row is None or not self.is_grouped_view():
+            return
+        
+        # Su un clone espanso si agisce sul suo parent, che lo precede nella lista
+        parent_index = self.current_game_index
+        parent_row = self.catalog.get_parent_row(row)
+        if parent_row is None:
+            parent_row = row
+        
+        # Filtri e ordinamento non cambiano con cloni espansi (show_catalog_view li richiude)
+        clones = self.get_visible_clones(parent_row)
+        if parent_row != row:
+            parent_index -= clones.index(row) + 1
+        if not clones:
+            return
+        
+        # I cloni restano nella sezione del parent: si spostano solo gli inizi delle sezioni successive
+        jump_index = self.get_jump_index()
+        if parent_row in self.expanded_parents:
+            del self.games_list[parent_index + 1:parent_index + 1 + len(clones)]
+            self.expanded_parents.discard(parent_row)
+            self.current_game_index = parent_index
+            self.set_jump_index(jump_index.shifted(parent_index, -len(clones)))
+            print(f"➖ Cloni chiusi: {self.catalog.names[parent_row]}")
+        else:
+            self.games_list[parent_index + 1:parent_index + 1] = clones
+            self.expanded_parents.add(parent_row)
+            self.set_jump_index(jump_index.shifted(parent_index, len(clones)))
+            print(f"➕ {len(clones)} cloni di {self.catalog.names[parent_row]}")
+    
+    def _handle_search_keyboard(self, event):
+        """Gestisce la scrittura del testo di ricerca (modalità scrittura)"""
+        if event.key == pygame.K_RETURN:
+            self.edit_mode = False
+            self.search_games()
+        elif event.key == pygame.K_ESCAPE:
+            # Annulla la ricerca e torna alla lista completa
+            self.edit_mode = False
+            self.search_text = ""
+            self.search_games()
+        elif event.key == pygame.K_BACKSPACE:
+            self.search_text = self.search_text[:-1]
+            self.search_games_incremental()
+        elif event.unicode and event.unicode.isprintable():
+            self.search_text += event.unicode
+            self.search_games_incremental()
+    
+    def get_game_record(self, rom_name):
+        """Ritorna il record del catalogo per un nome ROM (lookup O(1) sull'indice)"""
+        if self.catalog is None:
+            return None
+        return self.catalog.find(rom_name)
     
     def get_game_name_from_xml(self, rom_name):
-        """Estrae il nome del gioco dal file XML della piattaforma"""
-        try:
-            if not hasattr(self, 'platform_paths') or not self.platform_paths.get('xml_path'):
-                return rom_name
-            
-            xml_path = self.platform_paths['xml_path']
-            if not os.path.exists(xml_path):
-                print(f"⚠️ File XML non trovato: {xml_path}")
-                return rom_name
-            
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            
-            # Cerca il gioco con il nome ROM specificato
-            for game in root.findall('game'):
-                if game.get('name') == rom_name:
-                    description = game.find('description')
-                    if description is not None:
-                        return description.text
-                    break
-            
-            return rom_name
-        except Exception as e:
-            print(f"❌ Errore lettura XML: {e}")
-            return rom_name
+        """Estrae il nome del gioco dal catalogo della piattaforma"""
+        record = self.get_game_record(rom_name)
+        if record is not None and record['description']:
+            return record['description']
+        return rom_name
     
     def download_rom(self):
         """Avvia il processo di download ROM con conferma"""
-        if self.current_game_index < len(self.games_list):
-            game_name = self.games_list[self.current_game_index]
-            rom_name = game_name.split(' - ')[0].strip()  # Estrae il nome ROM (prima parte prima di " - ")
+        row = self.get_selected_row()
+        if row is not None:
+            rom_name = self.catalog.names[row]
+            
+            # ROM già presente nella cartella: niente conferma né download
+            if self.installed_roms is not None and rom_name in self.installed_roms:
+                logger.info(f"✅ ROM già presente: {rom_name}")
+                self.show_toast(f"ROM già presente: {rom_name}")
+                return
             
             # Ottieni il nome completo del gioco dal XML
             full_game_name = self.get_game_name_from_xml(rom_name)
@@ -1182,6 +1864,10 @@ class ArcadeUI:
                 # Verifica se la cartella di destinazione esiste
                 folder_exists = os.path.exists(roms_path)
                 
+                # Dimensione prevista dal DAT (non compressa) e spazio libero nella cartella ROM
+                expected_size = self.catalog.sizes[row]
+                free_space = shutil.disk_usage(roms_path).free if folder_exists else None
+                
                 # Salva le informazioni per la conferma
                 self.download_info = {
                     'rom_name': rom_name,
@@ -1190,7 +1876,10 @@ class ArcadeUI:
                     'roms_path': roms_path,
                     'rom_download_urls': rom_download_urls,  # Lista di URL da provare
                     'rom_extensions': rom_extensions,  # Lista delle estensioni
-                    'folder_exists': folder_exists
+                    'folder_exists': folder_exists,
+                    'expected_size': expected_size,
+                    'rom_count': self.catalog.rom_counts[row],
+                    'free_space': free_space
                 }
                 
                 # Attiva la modalità di conferma
@@ -1199,6 +1888,8 @@ class ArcadeUI:
                 logger.info(f"🔄 Download ROM: {full_game_name}")
                 logger.info(f"📁 Percorso destinazione: {full_rom_path}")
                 logger.info(f"🎮 Nome ROM: {rom_name} (proverà: {', '.join(rom_extensions)})")
+                logger.info(f"📏 Dimensione prevista: {self.format_size(expected_size)} "
+                            f"({self.catalog.rom_counts[row]} ROM, non compressa)")
                 logger.info(f"🌐 URL download da provare: {len(rom_download_urls)} opzioni")
                 for i, url in enumerate(rom_download_urls):
                     logger.info(f"   {i+1}. {url}")
@@ -1252,6 +1943,8 @@ class ArcadeUI:
             # Imposta stato finale
             if success:
                 self.download_state = 'success'
+                if self.installed_roms is not None:
+                    self.installed_roms.mark_installed(self.download_info['rom_name'])
                 self.download_result_message = f"Download completato: {self.download_info['rom_name']}.zip"
                 self.download_failure_reason = ""
                 logger.info(f"🎉 Download completato con successo!")
@@ -1395,15 +2088,12 @@ class ArcadeUI:
     
     def search_game_info(self):
         """Cerca informazioni del gioco selezionato"""
-        if self.current_game_index < len(self.games_list):
-            game_text = self.games_list[self.current_game_index]
-            # Nuovo formato: "Nome_rom - Descrizione troncata (anno, produttore)"
-            parts = game_text.split(' - ', maxsplit=1)
-            if len(parts) >= 2:
-                rom_name = parts[0].strip()
-                description_part = parts[1].strip()
-                # Estrai il nome completo dalla descrizione (prima parte)
-                game_name = description_part
+        row = self.get_selected_row()
+        if row is not None:
+            rom_name = self.catalog.names[row]
+            if rom_name:
+                # Nome completo del gioco dal catalogo
+                game_name = self.catalog.descriptions[row]
                 
                 print(f"🔍 Cerca info per: {game_name} ({rom_name})")
                 
@@ -1419,98 +2109,110 @@ class ArcadeUI:
                 # Breve pausa per assicurarsi che il toast venga mostrato
                 pygame.time.wait(100)
                 
-                # Inizializza con valori predefiniti
+                # Inizializza con i valori del catalogo (anno, produttore)
                 self.game_info = {
                     'name': game_name,
                     'rom_name': rom_name,
                     'description': f"Caricamento informazioni per {game_name}...",
-                    'year': "N/A",
-                    'manufacturer': "N/A"
+                    'year': self.catalog.years[row] or "N/A",
+                    'manufacturer': self.catalog.manufacturers[row] or "N/A",
+                    'platforms': ", ".join(self.get_game_platforms(rom_name))
                 }
                 
-                # URL per le informazioni del gioco (dinamico basato sulla piattaforma)
-                if hasattr(self, 'platform_paths') and self.platform_paths['info_url']:
-                    # Sostituisci {rom_name} con il nome ROM effettivo
-                    url = self.platform_paths['info_url'].replace('{rom_name}', rom_name)
+                # Descrizione dai file locali (history.dat, mameinfo.dat, command.dat): il servizio online è solo un ripiego
+                local_description = self.game_history.get_description(rom_name)
+                if local_description:
+                    self.game_info['description'] = self.format_description(local_description)
+                    self.game_info['clone_of'] = self.catalog.parents[row] or "N/A"
+                    print("✅ Descrizione letta dai file locali")
                 else:
-                    # Fallback al URL originale
-                    url = f"adb.arcadeitalia.net/service_scraper.php?ajax=query_mame&game_name={rom_name}&lang=it"
-                print(f"🔗 URL API: {url}")
+                    # URL per le informazioni del gioco (dinamico basato sulla piattaforma)
+                    if self.selected_platform is not None and self.selected_platform['info']:
+                        # Sostituisci {rom_name} con il nome ROM effettivo
+                        url = self.selected_platform.get_url('info', rom_name)
+                    else:
+                        # Fallback al URL originale
+                        url = f"adb.arcadeitalia.net/service_scraper.php?ajax=query_mame&game_name={rom_name}&lang=it"
+                    print(f"🔗 URL API: {url}")
                 
-                try:
-                    # Aggiunge il protocollo per la richiesta HTTP
-                    http_url = f"http://{url}"
-                    print(f"🌐 URL completo API: {http_url}")
+                    try:
+                        # Aggiunge il protocollo per la richiesta HTTP
+                        http_url = f"http://{url}"
+                        print(f"🌐 URL completo API: {http_url}")
                     
-                    # Effettua la richiesta HTTP
-                    response = requests.get(http_url, timeout=10)
-                    print(f"📊 Status Code API: {response.status_code}")
-                    print(f"📏 Dimensione risposta: {len(response.content)} bytes")
+                        # Effettua la richiesta HTTP
+                        response = requests.get(http_url, timeout=10)
+                        print(f"📊 Status Code API: {response.status_code}")
+                        print(f"📏 Dimensione risposta: {len(response.content)} bytes")
                     
-                    if response.status_code == 200:
-                        # Analizza la risposta JSON
-                        data = response.json()
+                        if response.status_code == 200:
+                            # Analizza la risposta JSON
+                            data = response.json()
                         
-                        if data.get('result') and len(data['result']) > 0:
-                            result = data['result'][0]
+                            if data.get('result') and len(data['result']) > 0:
+                                result = data['result'][0]
                             
-                            # Estrai le informazioni (come nel codice originale)
-                            description = result.get('history', "Nessuna descrizione disponibile")
-                            title = result.get('title', game_name)
-                            year = result.get('year', "N/A")
-                            manufacturer = result.get('manufacturer', "N/A")
-                            clone_of = result.get('cloneof', "N/A")
+                                # Estrai le informazioni (come nel codice originale)
+                                description = result.get('history') or ""
+                                title = result.get('title', game_name)
+                                year = result.get('year', "N/A")
+                                manufacturer = result.get('manufacturer', "N/A")
+                                clone_of = result.get('cloneof', "N/A")
                             
-                            # Formatta la descrizione con a capo appropriati
-                            if description and description != "Nessuna descrizione disponibile":
-                                # Aggiungi a capo ogni 80 caratteri per una migliore leggibilità
-                                description = self.format_description(description)
-                            clone_of = result.get('cloneof', "N/A")
+                                # Formatta la descrizione con a capo appropriati
+                                if description:
+                                    # Aggiungi a capo ogni 80 caratteri per una migliore leggibilità
+                                    description = self.format_description(description)
                             
-                            # Estrai URL delle immagini direttamente dal JSON
-                            url_image_ingame = result.get('url_image_ingame', "")
-                            url_image_cabinet = result.get('url_image_cabinet', "")
-                            url_image_title = result.get('url_image_title', "")
-                            url_image_marquee = result.get('url_image_marquee', "")
-                            url_image_border = result.get('url_image_border', "")
+                                # Estrai URL delle immagini direttamente dal JSON
+                                url_image_ingame = result.get('url_image_ingame', "")
+                                url_image_cabinet = result.get('url_image_cabinet', "")
+                                url_image_title = result.get('url_image_title', "")
+                                url_image_marquee = result.get('url_image_marquee', "")
+                                url_image_border = result.get('url_image_border', "")
                             
-                            print("🔗 URL immagini dal JSON:")
-                            print(f"  - ingame: {url_image_ingame}")
-                            print(f"  - cabinet: {url_image_cabinet}")
-                            print(f"  - title: {url_image_title}")
-                            print(f"  - marquee: {url_image_marquee}")
-                            print(f"  - border: {url_image_border}")
+                                print("🔗 URL immagini dal JSON:")
+                                print(f"  - ingame: {url_image_ingame}")
+                                print(f"  - cabinet: {url_image_cabinet}")
+                                print(f"  - title: {url_image_title}")
+                                print(f"  - marquee: {url_image_marquee}")
+                                print(f"  - border: {url_image_border}")
                             
-                            # Aggiorna le informazioni del gioco
-                            self.game_info = {
-                                'name': title,
-                                'rom_name': rom_name,
-                                'description': description,
-                                'year': year,
-                                'manufacturer': manufacturer,
-                                'clone_of': clone_of,
-                                'url_image_ingame': url_image_ingame,
-                                'url_image_cabinet': url_image_cabinet,
-                                'url_image_title': url_image_title,
-                                'url_image_marquee': url_image_marquee,
-                                'url_image_border': url_image_border
-                            }
+                                # Aggiorna le informazioni del gioco
+                                self.game_info = {
+                                    'name': title,
+                                    'rom_name': rom_name,
+                                    'description': description or "Nessuna descrizione disponibile",
+                                    'year': year,
+                                    'manufacturer': manufacturer,
+                                    'clone_of': clone_of,
+                                    'platforms': self.game_info.get('platforms', ""),
+                                    'url_image_ingame': url_image_ingame,
+                                    'url_image_cabinet': url_image_cabinet,
+                                    'url_image_title': url_image_title,
+                                    'url_image_marquee': url_image_marquee,
+                                    'url_image_border': url_image_border
+                                }
                             
-                            print("✅ Dati JSON caricati correttamente")
+                                # Conservate per il gamelist.xml (la cache immagini si svuota alla chiusura).
+                                # Senza descrizione si salva un campo vuoto, non il testo mostrato a video:
+                                # l'esportazione completa solo i campi vuoti
+                                self.game_info_store.put(rom_name, dict(self.game_info, description=description))
+                                print("✅ Dati JSON caricati correttamente")
+                            else:
+                                print("⚠️ Nessun risultato trovato nell'API")
                         else:
-                            print("⚠️ Nessun risultato trovato nell'API")
-                    else:
-                        print(f"⚠️ Errore API: HTTP {response.status_code}")
+                            print(f"⚠️ Errore API: HTTP {response.status_code}")
                 
-                except requests.exceptions.ConnectionError:
-                    print("⚠️ Errore di connessione durante il recupero delle informazioni")
-                    self.hide_toast()  # Nasconde il toast in caso di errore
-                except requests.exceptions.Timeout:
-                    print("⚠️ Timeout durante il recupero delle informazioni")
-                    self.hide_toast()  # Nasconde il toast in caso di errore
-                except Exception as e:
-                    print(f"⚠️ Errore nel recupero delle informazioni: {e}")
-                    self.hide_toast()  # Nasconde il toast in caso di errore
+                    except requests.exceptions.ConnectionError:
+                        print("⚠️ Errore di connessione durante il recupero delle informazioni")
+                        self.hide_toast()  # Nasconde il toast in caso di errore
+                    except requests.exceptions.Timeout:
+                        print("⚠️ Timeout durante il recupero delle informazioni")
+                        self.hide_toast()  # Nasconde il toast in caso di errore
+                    except Exception as e:
+                        print(f"⚠️ Errore nel recupero delle informazioni: {e}")
+                        self.hide_toast()  # Nasconde il toast in caso di errore
                 
                 # Prepara le righe della descrizione per lo scroll
                 # Calcola la larghezza della sezione info dinamicamente
@@ -1583,10 +2285,10 @@ class ArcadeUI:
             os.makedirs(cache_folder, exist_ok=True)
             
             # URL dinamici basati sulla piattaforma
-            if hasattr(self, 'platform_paths'):
+            if self.selected_platform is not None:
                 image_types = {
-                    'titolo': self.platform_paths['title_url'].replace('{rom_name}', rom_name),
-                    'ingame': self.platform_paths['ingame_url'].replace('{rom_name}', rom_name)
+                    'titolo': self.selected_platform.get_url('title', rom_name),
+                    'ingame': self.selected_platform.get_url('ingame', rom_name)
                 }
             else:
                 # Fallback agli URL originali
@@ -1746,6 +2448,14 @@ class ArcadeUI:
         
         return wrapped_lines
     
+    def format_size(self, size):
+        """Formatta una dimensione in byte (KB sotto 1MB, altrimenti MB o GB)"""
+        if size < 1024 * 1024:
+            return f"{size / 1024:.1f}KB"
+        if size < 1024 * 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f}MB"
+        return f"{size / (1024 * 1024 * 1024):.2f}GB"
+    
     def format_description(self, description):
         """Formatta la descrizione preservando i veri a capo e migliorando la leggibilità"""
         if not description:
@@ -1868,6 +2578,10 @@ class ArcadeUI:
             self.config_ui.draw(self.screen)
             # Aggiungi footer dinamico per la configurazione
             self.draw_dynamic_footer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        elif self.current_screen == 'unified':
+            # Disegna la vista unificata di tutte le piattaforme
+            self.draw_unified_screen()
+            self.draw_dynamic_footer(SCREEN_WIDTH, SCREEN_HEIGHT)
         else:
             # Disegna la schermata principale
             self.draw_main_screen()
@@ -1942,7 +2656,7 @@ class ArcadeUI:
         
         # Calcola altezza dinamica basata sul numero di URL e stato download
         urls = self.download_info.get('rom_download_urls', [])
-        base_height = 400  # Altezza base
+        base_height = 440  # Altezza base
         url_height = len(urls) * 25  # 25 pixel per URL (può essere più se wrapped)
         
         # Aggiungi spazio extra se in download o completato per barra di progresso
@@ -1998,6 +2712,19 @@ class ArcadeUI:
         self.screen.blit(path_text, (box_x + 20, y_offset))
         y_offset += 40
         
+        # Dimensione prevista dal DAT (in rosso se supera lo spazio libero)
+        expected_size = self.download_info.get('expected_size', 0)
+        free_space = self.download_info.get('free_space')
+        size_label = f"Dimensione prevista: {self.format_size(expected_size)} ({self.download_info.get('rom_count', 0)} ROM)"
+        size_color = self.colors['text']
+        if free_space is not None:
+            size_label += f" - Spazio libero: {self.format_size(free_space)}"
+            if expected_size > free_space:
+                size_color = (255, 100, 100)
+        size_text = self.font_medium.render(size_label, True, size_color)
+        self.screen.blit(size_text, (box_x + 20, y_offset))
+        y_offset += 40
+        
         # URL download (mostra tutte le opzioni)
         urls = self.download_info.get('rom_download_urls', [])
         extensions = self.download_info.get('rom_extensions', [])
@@ -2149,18 +2876,62 @@ class ArcadeUI:
         instructions_rect = instructions.get_rect(center=(screen_width//2, y_offset))
         self.screen.blit(instructions, instructions_rect)
     
+    def render_list_text(self, row, prefix, max_chars, color):
+        """Testo renderizzato di una riga della lista, creato solo quando la riga diventa visibile.
+
+        Il testo deriva dal catalogo al momento del disegno e resta in una
+        piccola memo LRU: scorrendo la lista si renderizzano solo le righe nuove.
+        """
+        cache = self.list_text_cache
+        if self.list_text_catalog is not self.catalog:
+            cache.clear()
+            self.list_text_catalog = self.catalog
+        key = (row, prefix, max_chars, color)
+        surface = cache.get(key)
+        if surface is not None:
+            cache.move_to_end(key)
+            return surface
+        text = (prefix + self.catalog.display_text(row))[:max_chars]
+        surface = cache[key] = self.font_medium.render(text, True, color)
+        if len(cache) > LIST_TEXT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return surface
+    
     def draw_games_list(self, x, y, width, height):
         """Disegna la lista dei giochi"""
         # Bordo sezione - sempre grigio dato che non si naviga più tra sezioni
         border_color = self.colors['surface']
         pygame.draw.rect(self.screen, border_color, (x-5, y-5, width+10, height+10), 3)
         
-        # Titolo
-        title_text = self.font_medium.render("LISTA GIOCHI", True, self.colors['text'])
+        # Titolo - in modalità ricerca mostra il testo cercato
+        if self.edit_mode:
+            title_text = self.font_medium.render(f"CERCA: {self.search_text}_", True, self.colors['accent2'])
+        elif self.search_text:
+            title_text = self.font_medium.render(f"CERCA: {self.search_text}", True, self.colors['text'])
+        else:
+            title_text = self.font_medium.render(f"LISTA GIOCHI ({SORT_ORDER_LABELS[self.sort_order]})", True, self.colors['text'])
         self.screen.blit(title_text, (x, y-40))
         
-        # Indicatore di posizione
+        # Indicatore di caricamento con conteggio dei giochi già disponibili
+        if self.catalog_loader is not None and self.catalog_loader.is_loading:
+            dots = "." * (int(time.time() * 3) % 4)
+            loading_text = f"Caricamento{dots} {len(self.games_list)} giochi"
+            loading_surface = self.font_small.render(loading_text, True, self.colors['accent2'])
+            self.screen.blit(loading_surface, (x + title_text.get_width() + 20, y-35))
+        elif self.facet_filter:
+            # Filtri attivi accanto al titolo
+            filter_surface = self.font_small.render(f"[{self.get_facet_filter_label()}]"[:width//10], True, self.colors['accent2'])
+            self.screen.blit(filter_surface, (x + title_text.get_width() + 20, y-35))
+        
+        # Nessun gioco da mostrare: messaggio di errore al posto della lista
         total_games = len(self.games_list)
+        if total_games == 0 or self.catalog is None:
+            if self.games_list_message:
+                message_surface = self.font_small.render(self.games_list_message[:width//8], True, self.colors['text_secondary'])
+                self.screen.blit(message_surface, (x+5, y+10))
+            return
+        
+        # Indicatore di posizione
         position_text = f"{self.current_game_index+1}/{total_games}"
         pos_surface = self.font_small.render(position_text, True, self.colors['accent'])
         self.screen.blit(pos_surface, (x+width-80, y-40))
@@ -2181,7 +2952,9 @@ class ArcadeUI:
         start_index = max(0, self.current_game_index - half_visible)
         end_index = min(len(self.games_list), start_index + visible_items)
         
-        for i, game in enumerate(self.games_list[start_index:end_index]):
+        grouped = self.is_grouped_view()
+        installed = self.installed_roms
+        for i, row in enumerate(self.games_list[start_index:end_index]):
             game_index = start_index + i
             game_y = y + (i * item_height)
             
@@ -2193,11 +2966,38 @@ class ArcadeUI:
                 color = self.colors['text']
             
             # Testo gioco - tronca se troppo lungo e centra verticalmente
-            game_text = self.font_medium.render(game[:width//8], True, color)  # Limita il testo in base alla larghezza
+            prefix = ""
+            if grouped:
+                # Vista raggruppata: +/- sui parent con cloni, cloni rientrati
+                if row in self.catalog.clones:
+                    prefix = "- " if row in self.expanded_parents else "+ "
+                elif self.catalog.get_parent_row(row) is not None:
+                    prefix = "    "
+                    if game_index != self.current_game_index:
+                        color = self.colors['text_secondary']
+                else:
+                    prefix = "  "
+            game_text = self.render_list_text(row, prefix, width // 8, color)  # Limita il testo in base alla larghezza
             # Centra il testo verticalmente nell'elemento
             text_y = game_y + (item_height - game_text.get_height()) // 2
             self.screen.blit(game_text, (x+5, text_y))
             
+            # ROM già installata: pallino a destra (lookup nell'insieme, nessun accesso al disco)
+            if installed is not None and self.catalog.names[row] in installed:
+                pygame.draw.circle(self.screen, self.colors['accent2'], (x + width - 12, game_y + item_height // 2 - 1), 5)
+        
+        # Lettera (o anno) della sezione raggiunta con un salto
+        if self.jump_overlay_label and time.time() - self.jump_overlay_time < JUMP_OVERLAY_DURATION:
+            label_surface = self.font_large.render(self.jump_overlay_label, True, self.colors['accent'])
+            label_rect = label_surface.get_rect(center=(x + width // 2, y + height // 2))
+            bg_rect = label_rect.inflate(40, 24)
+            bg_surface = pygame.Surface(bg_rect.size)
+            bg_surface.set_alpha(220)
+            bg_surface.fill(self.colors['surface'])
+            self.screen.blit(bg_surface, bg_rect)
+            pygame.draw.rect(self.screen, self.colors['accent'], bg_rect, 2)
+            self.screen.blit(label_surface, label_rect)
+            
         # Indicatore di scrolling veloce
         if hasattr(self.joystick_manager, 'dpad_pressed'):
             if self.joystick_manager.dpad_pressed['up'] or self.joystick_manager.dpad_pressed['down']:
@@ -2225,6 +3025,89 @@ class ArcadeUI:
     
     
     
+    def render_unified_text(self, row, max_chars, color):
+        """Testi renderizzati di una riga della vista unificata (gioco, piattaforme), in una piccola memo LRU"""
+        cache = self.unified_text_cache
+        key = (row, max_chars, color)
+        surfaces = cache.get(key)
+        if surfaces is not None:
+            cache.move_to_end(key)
+            return surfaces
+        platforms = self.platform_manager.platforms
+        names = ", ".join(platforms[index]['name'] for index in self.get_unified_platforms(row))
+        game_text = self.unified_catalog.display_text(row)[:max_chars]
+        surfaces = cache[key] = (self.font_medium.render(game_text, True, color),
+                                 self.font_small.render(names[:max_chars], True, self.colors['accent2']))
+        if len(cache) > LIST_TEXT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return surfaces
+    
+    def draw_unified_screen(self):
+        """Disegna la vista unificata: ricerca e lista dei giochi con la colonna delle piattaforme"""
+        screen_info = self.get_screen_info()
+        x = 20
+        y = 100
+        width = screen_info['width'] - 50
+        height = screen_info['height'] - 220
+        pygame.draw.rect(self.screen, self.colors['surface'], (x-5, y-5, width+10, height+10), 3)
+        
+        # Titolo: il testo scritto da tastiera filtra la lista
+        if self.unified_search_text:
+            title = f"TUTTE LE PIATTAFORME - CERCA: {self.unified_search_text}_"
+        else:
+            title = "TUTTE LE PIATTAFORME (scrivi per cercare)"
+        title_surface = self.font_medium.render(title, True, self.colors['accent2'] if self.unified_search_text else self.colors['text'])
+        self.screen.blit(title_surface, (x, y-40))
+        
+        unified_list = self.unified_list
+        if self.unified_catalog is None or unified_list is None:
+            if self.unified_catalog_state == 'done':
+                message = "Catalogo unificato non disponibile"
+            else:
+                dots = "." * (int(time.time() * 3) % 4)
+                message = f"Preparazione catalogo unificato{dots}"
+            message_surface = self.font_small.render(message, True, self.colors['text_secondary'])
+            self.screen.blit(message_surface, (x+5, y+10))
+            return
+        total_games = len(unified_list)
+        if total_games == 0:
+            message_surface = self.font_small.render("Nessun gioco trovato", True, self.colors['text_secondary'])
+            self.screen.blit(message_surface, (x+5, y+10))
+            return
+        
+        position_surface = self.font_small.render(f"{self.unified_index+1}/{total_games}", True, self.colors['accent'])
+        self.screen.blit(position_surface, (x+width-position_surface.get_width(), y-40))
+        
+        # Colonna dei giochi a sinistra, colonna delle piattaforme a destra
+        font_height = self.font_medium.get_height()
+        item_height = max(30, font_height + 8)
+        visible_items = height // item_height
+        start_index = max(0, self.unified_index - visible_items // 2)
+        end_index = min(total_games, start_index + visible_items)
+        platforms_x = x + width * 3 // 5
+        for i, row in enumerate(unified_list[start_index:end_index]):
+            game_y = y + i * item_height
+            if start_index + i == self.unified_index:
+                color = self.colors['selected']
+                pygame.draw.rect(self.screen, color, (x, game_y-2, width, item_height-2), 2)
+            else:
+                color = self.colors['text']
+            game_surface, platforms_surface = self.render_unified_text(row, width * 3 // 5 // 10, color)
+            self.screen.blit(game_surface, (x+5, game_y + (item_height - game_surface.get_height()) // 2))
+            self.screen.blit(platforms_surface, (platforms_x, game_y + (item_height - platforms_surface.get_height()) // 2))
+        
+        # Lettera della sezione raggiunta con un salto
+        if self.jump_overlay_label and time.time() - self.jump_overlay_time < JUMP_OVERLAY_DURATION:
+            label_surface = self.font_large.render(self.jump_overlay_label, True, self.colors['accent'])
+            label_rect = label_surface.get_rect(center=(x + width // 2, y + height // 2))
+            bg_rect = label_rect.inflate(40, 24)
+            bg_surface = pygame.Surface(bg_rect.size)
+            bg_surface.set_alpha(220)
+            bg_surface.fill(self.colors['surface'])
+            self.screen.blit(bg_surface, bg_rect)
+            pygame.draw.rect(self.screen, self.colors['accent'], bg_rect, 2)
+            self.screen.blit(label_surface, label_rect)
+    
     def draw_info_section(self, x, y, width, height):
         """Disegna la sezione informazioni gioco"""
         # Bordo sezione - sempre grigio dato che non si naviga più tra sezioni
@@ -2264,6 +3147,12 @@ class ArcadeUI:
             self.screen.blit(manuf_text, (x+10, current_y))
             current_y += line_height
             
+            # Piattaforme che contengono il gioco (catalogo unificato)
+            if self.game_info.get('platforms'):
+                platforms_text = self.font_small.render(f"Piattaforme: {self.game_info['platforms']}", True, self.colors['text'])
+                self.screen.blit(platforms_text, (x+10, current_y))
+                current_y += line_height
+            
             # Clone of (se presente)
             if 'clone_of' in self.game_info and self.game_info['clone_of'] != "N/A":
                 clone_text = self.font_small.render(f"Clone di: {self.game_info['clone_of']}", True, self.colors['text'])
@@ -2526,6 +3415,9 @@ class ArcadeUI:
         elif screen_type == 'config':
             # Schermata configurazione: info (conferma) e rom (indietro)
             icon_order = ['info', 'rom']
+        elif screen_type == 'unified':
+            # Vista unificata: apri il gioco, indietro, scorrimento e uscita
+            icon_order = ['info', 'rom', 'scroll', 'start']
         else:
             # Schermata principale: tutte le icone incluso scroll
             icon_order = ['info', 'rom', 'download', 'scroll', 'start']
@@ -2554,6 +3446,12 @@ class ArcadeUI:
                         backspace_text = None
                         esc_text = None
                         space_text = None
+                    elif screen_type == 'unified':
+                        label_text = "Apri gioco"
+                        enter_text = "/Enter"
+                        backspace_text = None
+                        esc_text = None
+                        space_text = None
                     else:
                         label_text = "Seleziona/Info"
                         enter_text = "/Enter"
@@ -2627,17 +3525,29 @@ class ArcadeUI:
                 
                 x_offset += icon_spacing
     
+    def export_gamelists(self):
+        """Aggiorna il gamelist.xml di ogni piattaforma aperta in questa sessione"""
+        for name, platform in self.gamelist_platforms.items():
+            try:
+                GamelistExporter(platform, self.game_history).export()
+            except Exception as e:
+                logger.warning(f"Errore esportazione gamelist di {name}: {e}")
+    
     def clear_cache_on_exit(self):
-        """Pulisce tutta la cache alla chiusura dell'applicazione"""
+        """Pulisce la cache immagini alla chiusura dell'applicazione, mantenendo gli snapshot dei cataloghi"""
         try:
             # Pulisce sempre la cartella cache principale (non solo quella della piattaforma corrente)
             cache_folder = os.path.join(os.getcwd(), "cache")
             
             if os.path.exists(cache_folder):
                 import shutil
-                shutil.rmtree(cache_folder)
-                print(f"🗑️ Cache completa pulita: {cache_folder}")
-                logger.info(f"🗑️ Cache completa pulita alla chiusura: {cache_folder}")
+                # Le immagini stanno nelle sottocartelle delle piattaforme, gli snapshot
+                # dei cataloghi sono file accanto ad esse e sopravvivono al riavvio
+                for entry in os.scandir(cache_folder):
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                print(f"🗑️ Cache immagini pulita: {cache_folder}")
+                logger.info(f"🗑️ Cache immagini pulita alla chiusura: {cache_folder}")
             else:
                 print("ℹ️ Nessuna cache da pulire")
                 logger.info("ℹ️ Nessuna cache da pulire")
@@ -2681,9 +3591,29 @@ class ArcadeUI:
                 events = pygame.event.get()
                 running = self.handle_input(events)
                 
+                # Pubblica i giochi caricati in background dall'ultimo frame
+                self.update_catalog_loading()
+                self.update_catalog_memory()
+                self.update_unified_catalog()
+                self.update_rom_audit()
+                
                 self.draw()
                 self.clock.tick(FPS)
         finally:
+            # Ferma i processi in background: l'uscita non aspetta i DAT ancora in lettura
+            if self.catalog_preloader is not None:
+                self.catalog_preloader.shutdown()
+            if self.catalog_loader is not None:
+                self.catalog_loader.cancel()
+            if self.installed_roms is not None:
+                self.installed_roms.stop()
+            # Informazioni scaricate in questa sessione, scritte una volta sola
+            if self.game_info_store is not None:
+                self.game_info_store.save()
+            # Gamelist di EmulationStation, finché le immagini sono ancora in cache
+            if EXPORT_GAMELIST:
+                self.export_gamelists()
+            self.game_history.close()
             # Pulisce la cache prima di uscire
             self.clear_cache_on_exit()
             pygame.quit()
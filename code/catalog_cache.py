@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Catalog Cache
+========================
+Cataloghi delle piattaforme già aperte tenuti in memoria (LRU con un budget
+di memoria), per tornare a una piattaforma senza ricaricare nulla.
+"""
+
+import sys
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger('LRscript')
+
+# Byte stimati per ogni oggetto Python referenziato da una lista/dizionario (puntatore + overhead)
+_OBJECT_OVERHEAD = 56
+
+
+def _arrays_size(arrays):
+    """Byte occupati da un insieme di array"""
+    return sum(values.itemsize * len(values) + 64 for values in arrays)
+
+
+def estimate_index_memory(index):
+    """Stima della memoria di un indice in memoria (prefissi, trigrammi, faccette)"""
+    if index is None:
+        return 0
+    size = 0
+    tokens = getattr(index, 'tokens', None)
+    if tokens is not None:
+        size += sum(len(token) for token in tokens) + len(tokens) * _OBJECT_OVERHEAD
+    postings = getattr(index, 'postings', None)
+    if isinstance(postings, dict):
+        size += len(postings) * (_OBJECT_OVERHEAD * 2) + _arrays_size(postings.values())
+    elif postings is not None:
+        size += _arrays_size(postings)
+    bitmaps = getattr(index, 'bitmaps', None)
+    if bitmaps is not None:
+        count = sum(len(values) for values in bitmaps.values()) + 2
+        size += count * (index.size_bytes + _OBJECT_OVERHEAD)
+    return size
+
+
+class CatalogSession:
+    """Stato completo di una piattaforma aperta: catalogo (con le viste degli ordinamenti), indici e filtri"""
+
+    def __init__(self, catalog, search_index=None, prefix_index=None, trigram_index=None, facets=None,
+                 facet_filter=None, facet_values=None):
+        self.catalog = catalog
+        self.search_index = search_index
+        self.prefix_index = prefix_index
+        self.trigram_index = trigram_index
+        self.facets = facets
+        self.facet_filter = facet_filter or {}
+        self.facet_values = facet_values or {}
+
+    def estimate_memory(self):
+        """Stima dei byte occupati dalla sessione (ricalcolata: gli indici si completano in background)"""
+        size = self.catalog.estimate_memory()
+        for index in (self.prefix_index, self.trigram_index, self.facets):
+            size += estimate_index_memory(index)
+        return size
+
+
+class CatalogCache:
+    """LRU delle sessioni delle piattaforme, entro un budget di memoria stimata.
+
+    Il budget comprende anche la sessione della piattaforma aperta (spesso
+    la più grande), registrata con activate(): le sessioni in cache sono
+    scartate finché cache e sessione attiva non stanno nel budget.
+    La posizione nella lista (nome ROM selezionato) è ricordata per ogni
+    piattaforma anche dopo che la sua sessione è stata scartata.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.sessions = OrderedDict()  # chiave piattaforma -> CatalogSession, dalla meno recente
+        self.cursors = {}              # chiave piattaforma -> nome ROM selezionato
+        self.active = None             # Sessione della piattaforma aperta, fuori dalla LRU
+
+    def get(self, key, fingerprint):
+        """Sessione della piattaforma se in cache e compilata dallo stesso DAT, altrimenti None"""
+        session = self.sessions.pop(key, None)
+        if session is None:
+            return None
+        if session.catalog.fingerprint != tuple(fingerprint):
+            logger.info(f"Catalogo in memoria di {key} obsoleto, da ricaricare")
+            self.close_session(session)
+            return None
+        # Esce dalla LRU mentre è in uso (conta come sessione attiva): ci rientra con put() al cambio piattaforma
+        return session
+
+    def activate(self, session):
+        """Registra la sessione della piattaforma aperta e libera spazio per lei nel budget"""
+        self.active = session
+        self.trim()
+
+    def put(self, key, session):
+        """Aggiunge la sessione della piattaforma lasciata e scarta le meno recenti oltre il budget"""
+        # La piattaforma lasciata non è più quella attiva
+        self.active = None
+        if self.budget_bytes <= 0:
+            self.close_session(session)
+            return
+        self.sessions[key] = session
+        self.sessions.move_to_end(key)
+        self.trim()
+
+    def trim(self):
+        """Scarta le sessioni meno recenti finché cache e sessione attiva stanno nel budget"""
+        active_size = self.active.estimate_memory() if self.active is not None else 0
+        sizes = {name: cached.estimate_memory() for name, cached in self.sessions.items()}
+        total = sum(sizes.values()) + active_size
+        while total > self.budget_bytes and self.sessions:
+            name, evicted = self.sessions.popitem(last=False)
+            total -= sizes[name]
+            self.close_session(evicted)
+            logger.info(f"Catalogo {name} rimosso dalla memoria ({sizes[name] // (1024 * 1024)}MB stimati)")
+        logger.info(f"Cataloghi in memoria: {len(self.sessions)} più quello aperto, "
+                    f"{total // (1024 * 1024)}MB stimati su {self.budget_bytes // (1024 * 1024)}MB")
+
+    def close_session(self, session):
+        """Libera le risorse esterne di una sessione scartata"""
+        if session.search_index is not None:
+            session.search_index.close()
+
+    def remember_cursor(self, key, rom_name):
+        """Memorizza il gioco selezionato di una piattaforma"""
+        if rom_name:
+            self.cursors[key] = sys.intern(rom_name)
+
+    def get_cursor(self, key):
+        """Nome ROM selezionato l'ultima volta nella piattaforma, None se mai aperta"""
+        return self.cursors.get(key)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Catalog Loader
+=========================
+Caricamento del catalogo in background con pubblicazione progressiva dei giochi.
+"""
+
+import threading
+import logging
+import xml.etree.ElementTree as ET
+
+from code.dat_parser import iter_dat_games
+from code.game_catalog import (GameCatalog, DEFAULT_SORT_ORDER, get_dat_fingerprint, get_parallel_workers,
+                               get_snapshot_path)
+from code.game_search import PrefixIndex
+from code.process_pool import create_background_pool, get_mp_context, terminate_pool
+
+logger = logging.getLogger('LRscript')
+
+
+class CatalogLoader:
+    """Carica il catalogo di una piattaforma in un thread separato.
+
+    Durante la lettura del DAT i giochi vengono resi visibili a blocchi
+    tramite published_count: le righe sotto questo valore sono complete e
+    possono essere lette dal loop pygame mentre il thread continua.
+    """
+
+    BATCH_SIZE = 500  # Giochi letti prima di pubblicare un nuovo blocco
+
+    def __init__(self, xml_path, cache_path, indexes=(), parse_workers=1):
+        self.xml_path = xml_path
+        self.cache_path = cache_path
+        # Processi per leggere il DAT in parallelo (1 = lettura sequenziale, 0 = automatico)
+        self.parse_workers = parse_workers
+        # Indici (trigrammi, faccette, FTS5...) costruiti con build(catalog) a catalogo completo
+        self.indexes = indexes
+        self.catalog = GameCatalog()
+        self.published_count = 0
+        self.prefix_index = None    # Indice a prefisso per la ricerca durante la digitazione
+        self.delta = None           # Differenze rispetto allo snapshot precedente (DAT aggiornato)
+        self.state = 'idle'         # 'idle', 'loading', 'done', 'error'
+        self.error_message = ""
+        self.cancelled = False
+        self.executor = None        # Pool della lettura parallela del DAT, se in corso
+        self.thread = None
+
+    @property
+    def is_loading(self):
+        """True finché il thread sta ancora leggendo il catalogo"""
+        return self.state == 'loading'
+
+    def start(self):
+        """Avvia il caricamento in un thread separato"""
+        self.state = 'loading'
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def cancel(self):
+        """Interrompe il caricamento (es. cambio piattaforma o chiusura applicazione)"""
+        self.cancelled = True
+        # Il thread può essere fermo in attesa di un blocco del DAT: si terminano i processi
+        executor = self.executor
+        if executor is not None:
+            terminate_pool(executor)
+
+    def _worker(self):
+        """Worker thread per il caricamento del catalogo"""
+        try:
+            fingerprint = get_dat_fingerprint(self.xml_path)
+            snapshot_path = get_snapshot_path(self.cache_path)
+
+            catalog = GameCatalog.load_snapshot(snapshot_path, fingerprint)
+            if catalog is not None:
+                logger.info(f"Catalogo caricato da snapshot: {snapshot_path} ({len(catalog)} giochi)")
+                self.catalog = catalog
+            else:
+                logger.info(f"Compilazione catalogo da DAT in background: {self.xml_path}")
+                catalog = GameCatalog(fingerprint)
+                self.catalog = catalog
+                workers = get_parallel_workers(self.xml_path, self.parse_workers) if self.parse_workers != 1 else 0
+                if workers:
+                    # Blocchi del DAT letti da più processi, pubblicati nell'ordine del file
+                    self.executor = create_background_pool(workers, get_mp_context())
+                    try:
+                        for count in catalog.read_dat_parallel(self.xml_path, workers, self.executor):
+                            if self.cancelled:
+                                break
+                            self.published_count = count
+                    except Exception:
+                        # Processi terminati da cancel(): non è un errore di lettura
+                        if not self.cancelled:
+                            raise
+                    finally:
+                        self.executor = None
+                    if self.cancelled:
+                        logger.info(f"Caricamento catalogo annullato: {self.xml_path}")
+                        return
+                else:
+                    for game in iter_dat_games(self.xml_path):
+                        if self.cancelled:
+                            logger.info(f"Caricamento catalogo annullato: {self.xml_path}")
+                            return
+                        catalog.add_game(game)
+                        if len(catalog) - self.published_count >= self.BATCH_SIZE:
+                            self.published_count = len(catalog)
+                # DAT aggiornato: se cambiano pochi giochi ordinamenti e indice FTS5 ricevono
+                # solo le differenze; prefissi, trigrammi e faccette si ricostruiscono comunque
+                self.delta = catalog.apply_previous_snapshot(snapshot_path)
+                # Ordinamenti, liste dei parent e posizioni calcolati qui, non nel loop pygame,
+                # e salvati nello snapshot
+                catalog.build_orders()
+                catalog.save_snapshot(snapshot_path)
+
+            self.published_count = len(catalog)
+            catalog.group_clones(catalog.get_order(DEFAULT_SORT_ORDER))
+            self.prefix_index = PrefixIndex(catalog)
+            self.state = 'done'
+            logger.info(f"Catalogo pronto: {len(catalog)} giochi")
+
+            # La lista è già utilizzabile: gli indici si costruiscono dopo, nell'ordine dato.
+            # Solo CatalogSearchIndex (FTS5) usa catalog.delta, gli indici in memoria sono ricostruiti da zero
+            for index in self.indexes:
+                if self.cancelled:
+                    break
+                index.build(catalog)
+        except ET.ParseError as e:
+            logger.error(f"Errore parsing XML: {e}")
+            self.error_message = f"Errore parsing XML: {e}"
+            self.state = 'error'
+        except Exception as e:
+            logger.error(f"Errore caricamento catalogo: {e}")
+            self.error_message = f"Errore caricamento catalogo: {e}"
+            self.state = 'error'
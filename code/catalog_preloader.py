@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Catalog Preloader
+============================
+Compilazione parallela degli snapshot di tutte le piattaforme (e del catalogo
+unificato) all'avvio.
+"""
+
+import os
+import time
+import threading
+import logging
+from concurrent.futures import as_completed
+
+from code.game_catalog import GameCatalog, get_dat_fingerprint, get_snapshot_path, is_snapshot_current
+from code.game_search import CatalogSearchIndex, get_search_db_path
+from code.unified_catalog import UNIFIED_CACHE_PATH, compile_unified_catalog, get_unified_fingerprint
+from code.process_pool import (BACKGROUND_NICENESS, create_background_pool, get_background_workers,
+                               get_mp_context, terminate_pool)
+
+logger = logging.getLogger('LRscript')
+
+
+def compile_platform_catalog(xml_path, cache_path, parse_workers=1):
+    """Compila snapshot e indice di ricerca di una piattaforma (eseguita in un processo separato)"""
+    start_time = time.time()
+    snapshot_path = get_snapshot_path(cache_path)
+    catalog = GameCatalog.from_dat(xml_path, parse_workers)
+    catalog.apply_previous_snapshot(snapshot_path)
+    catalog.save_snapshot(snapshot_path)
+    CatalogSearchIndex(get_search_db_path(cache_path)).build(catalog)
+    return len(catalog), time.time() - start_time
+
+
+class CatalogPreloader:
+    """Precarica in parallelo gli snapshot dei cataloghi mentre è visibile il menu piattaforme"""
+
+    def __init__(self, platforms, max_workers=0, niceness=BACKGROUND_NICENESS):
+        self.platforms = platforms
+        self.niceness = niceness
+        # Budget CPU: di default resta libero un core per il loop pygame
+        self.max_workers = get_background_workers(max_workers)
+        self.state = 'idle'  # 'idle', 'running', 'done'
+        self.completed = 0
+        self.total = 0
+        self.executor = None
+        self.thread = None
+
+    def get_pending_platforms(self):
+        """Piattaforme con DAT presente e snapshot (o indice di ricerca) mancante o obsoleto"""
+        pending = []
+        for platform in self.platforms:
+            xml_path = platform.get('xml')
+            if not xml_path or not os.path.exists(xml_path):
+                continue
+            fingerprint = get_dat_fingerprint(xml_path)
+            search_index = CatalogSearchIndex(get_search_db_path(platform['path']))
+            if (not is_snapshot_current(get_snapshot_path(platform['path']), fingerprint) or
+                    not search_index.is_current(fingerprint)):
+                pending.append(platform)
+        return pending
+
+    def is_unified_pending(self):
+        """True se lo snapshot del catalogo unificato manca o non corrisponde ai DAT attuali"""
+        return not is_snapshot_current(get_snapshot_path(UNIFIED_CACHE_PATH), get_unified_fingerprint(self.platforms))
+
+    def start(self):
+        """Avvia il precaricamento in background"""
+        self.state = 'running'
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def shutdown(self):
+        """Annulla i job in coda e termina quelli in corso (chiusura applicazione)"""
+        executor = self.executor
+        if executor is not None:
+            terminate_pool(executor)
+
+    def _worker(self):
+        """Thread che distribuisce i DAT sul pool di processi"""
+        try:
+            pending = self.get_pending_platforms()
+            unified_pending = self.is_unified_pending()
+            self.total = len(pending) + unified_pending
+            if not self.total:
+                logger.info("Precaricamento cataloghi: tutti gli snapshot sono aggiornati")
+                return
+
+            mp_context = get_mp_context()
+            if mp_context is None:
+                # Senza fork i processi figli rieseguirebbero l'avvio dell'app: compila qui in sequenza
+                logger.info("Precaricamento cataloghi senza pool di processi")
+                for platform in pending:
+                    count, elapsed = compile_platform_catalog(platform['xml'], platform['path'])
+                    self.completed += 1
+                    logger.info(f"Precaricato {platform['name']}: {count} giochi in {elapsed:.1f}s")
+                if unified_pending:
+                    count, elapsed = compile_unified_catalog(self.platforms)
+                    self.completed += 1
+                    logger.info(f"Catalogo unificato: {count} giochi in {elapsed:.1f}s")
+                return
+
+            workers = min(self.max_workers, self.total)
+            # Un solo DAT da compilare: i core liberi servono a leggerlo a blocchi in parallelo
+            parse_workers = self.max_workers if len(pending) == 1 else 1
+            logger.info(f"Precaricamento di {self.total} cataloghi con {workers} processi")
+            # Priorità più bassa del processo pygame: il menu resta fluido
+            self.executor = create_background_pool(workers, mp_context, self.niceness)
+            futures = {
+                self.executor.submit(compile_platform_catalog, platform['xml'], platform['path'],
+                                     parse_workers): platform['name']
+                for platform in pending
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    count, elapsed = future.result()
+                    logger.info(f"Precaricato {name}: {count} giochi in {elapsed:.1f}s")
+                except Exception as e:
+                    logger.warning(f"Errore precaricamento {name}: {e}")
+                self.completed += 1
+            if unified_pending:
+                # Dopo le piattaforme: il catalogo unificato si compone dai loro snapshot aggiornati
+                future = self.executor.submit(compile_unified_catalog, self.platforms)
+                try:
+                    count, elapsed = future.result()
+                    logger.info(f"Catalogo unificato: {count} giochi in {elapsed:.1f}s")
+                except Exception as e:
+                    logger.warning(f"Errore precaricamento catalogo unificato: {e}")
+                self.completed += 1
+            self.executor.shutdown(wait=True)
+        except Exception as e:
+            logger.error(f"Errore precaricamento cataloghi: {e}")
+        finally:
+            self.executor = None
+            self.state = 'done'
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - DAT Parser
+=====================
+Lettura in streaming dei file DAT/XML MAME con memoria costante, anche
+compressi (gzip, bzip2, xz o zip).
+"""
+
+import io
+import os
+import re
+import bz2
+import gzip
+import lzma
+import mmap
+import zipfile
+import xml.etree.ElementTree as ET
+import logging
+
+logger = logging.getLogger('LRscript')
+
+# Tag che identificano un gioco nei DAT (MAME vecchi/FBNeo usano <game>, MAME recenti <machine>)
+GAME_TAGS = ('game', 'machine')
+
+# Firme dei formati compressi accettati per il DAT (riconosciuti dal contenuto, non dall'estensione)
+COMPRESSED_SIGNATURES = (
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open)
+)
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+# Estensioni preferite per scegliere il DAT dentro uno zip
+DAT_EXTENSIONS = ('.dat', '.xml')
+
+# Inizio di un gioco nel testo del DAT, usato per dividerlo in blocchi senza parsing
+GAME_OPEN_TAGS = (b'<game ', b'<machine ')
+
+_ENCODING_RE = re.compile(rb'encoding=["\']([A-Za-z0-9._-]+)["\']')
+
+
+def _open_zip_member(xml_path):
+    """Apre in streaming il DAT contenuto in uno zip (il primo .dat/.xml, altrimenti il più grande)"""
+    archive = zipfile.ZipFile(xml_path)
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    if not members:
+        archive.close()
+        raise ValueError(f"Nessun file nello zip {xml_path}")
+    dat_members = [info for info in members if info.filename.lower().endswith(DAT_EXTENSIONS)]
+    member = dat_members[0] if dat_members else max(members, key=lambda info: info.file_size)
+    stream = archive.open(member)
+    # Lo stream resta valido dopo la chiusura dell'archivio: il file si chiude con lo stream
+    archive.close()
+    logger.info(f"DAT letto dallo zip {xml_path}: {member.filename}")
+    return stream
+
+
+def is_compressed_dat(xml_path):
+    """True se il DAT è compresso (gzip, bzip2, xz o zip)"""
+    with open(xml_path, 'rb') as f:
+        signature = f.read(6)
+    return (signature.startswith(ZIP_SIGNATURE) or
+            any(signature.startswith(magic) for magic, opener in COMPRESSED_SIGNATURES))
+
+
+def open_dat(xml_path):
+    """Apre il DAT come stream binario, decomprimendolo al volo se compresso.
+
+    Nessun file temporaneo: il parser legge direttamente dallo stream
+    decompresso, quindi dalla memoria si leggono solo i byte compressi.
+    """
+    with open(xml_path, 'rb') as f:
+        signature = f.read(6)
+    if signature.startswith(ZIP_SIGNATURE):
+        return _open_zip_member(xml_path)
+    for magic, opener in COMPRESSED_SIGNATURES:
+        if signature.startswith(magic):
+            return opener(xml_path, 'rb')
+    return open(xml_path, 'rb')
+
+
+def _child_text(elem, tag):
+    """Ritorna il testo di un figlio diretto o stringa vuota"""
+    child = elem.find(tag)
+    if child is not None and child.text:
+        return child.text.strip()
+    return ''
+
+
+def _rom_totals(elem):
+    """Dimensione totale, numero e CRC32 (int, nell'ordine del DAT) dei <rom> di un gioco.
+
+    Le ROM senza crc (es. nodump) contano nel numero ma non nella lista dei CRC.
+    """
+    total = 0
+    count = 0
+    crcs = []
+    for rom in elem.iter('rom'):
+        count += 1
+        try:
+            total += int(rom.get('size', 0))
+        except ValueError:
+            pass
+        crc = rom.get('crc')
+        if crc:
+            try:
+                crcs.append(int(crc, 16))
+            except ValueError:
+                pass
+    return total, count, crcs
+
+
+def iter_dat_games(xml_path):
+    """Legge il DAT in streaming e restituisce un dizionario per ogni <game>.
+
+    Ogni elemento viene liberato appena letto, quindi il consumo di memoria
+    non dipende dalla dimensione del DAT ma solo dal singolo gioco.
+    """
+    with open_dat(xml_path) as stream:
+        yield from _iter_stream_games(stream)
+
+
+def split_dat(xml_path, chunk_count):
+    """Divide un DAT non compresso in intervalli di byte che iniziano ciascuno con un gioco.
+
+    Il file è letto con mmap cercando solo i tag di apertura vicini ai punti
+    di taglio, senza fare il parsing. Ritorna (encoding, lista di (inizio, fine));
+    l'ultimo intervallo termina prima del tag di chiusura della radice.
+    """
+    with open(xml_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            candidates = [(mm.find(tag), tag) for tag in GAME_OPEN_TAGS]
+            candidates = [(position, tag) for position, tag in candidates if position >= 0]
+            if not candidates:
+                return None, []
+            first, tag = min(candidates)
+            end = mm.rfind(b'</')
+            match = _ENCODING_RE.search(mm[:min(first, 1024)])
+            encoding = match.group(1).decode('ascii') if match else None
+
+            starts = [first]
+            for index in range(1, chunk_count):
+                position = mm.find(tag, first + (end - first) * index // chunk_count, end)
+                if position < 0:
+                    break
+                if position > starts[-1]:
+                    starts.append(position)
+    return encoding, list(zip(starts, starts[1:] + [end]))
+
+
+def iter_dat_chunk(xml_path, start, end, encoding=None):
+    """Legge i giochi di un intervallo di byte ottenuto da split_dat"""
+    with open(xml_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # I giochi del blocco diventano figli di una radice fittizia, come nel DAT completo
+    declaration = f'<?xml version="1.0" encoding="{encoding}"?>'.encode('ascii') if encoding else b''
+    stream = io.BytesIO(declaration + b'<chunk>' + data + b'</chunk>')
+    yield from _iter_stream_games(stream)
+
+
+def _iter_stream_games(stream):
+    """Estrae i giochi da uno stream XML già aperto"""
+    context = ET.iterparse(stream, events=('start', 'end'))
+    root = None
+    depth = 0
+    for event, elem in context:
+        if event == 'start':
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        # Solo i <game> figli diretti della radice (depth 1 dopo la chiusura)
+        if depth != 1 or elem.tag not in GAME_TAGS:
+            continue
+
+        name = elem.get('name', '')
+        size, rom_count, crcs = _rom_totals(elem)
+        yield {
+            'name': name,
+            'description': _child_text(elem, 'description') or name,
+            'year': _child_text(elem, 'year'),
+            'manufacturer': _child_text(elem, 'manufacturer'),
+            'cloneof': elem.get('cloneof', ''),
+            'size': size,
+            'roms': rom_count,
+            'crcs': crcs
+        }
+
+        # Libera il gioco appena letto e il riferimento tenuto dalla radice
+        elem.clear()
+        root.clear()
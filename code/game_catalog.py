@@ -0,0 +1,656 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Game Catalog
+=======================
+Catalogo dei giochi di una piattaforma con snapshot binario su disco.
+"""
+
+import os
+import re
+import sys
+import zlib
+import struct
+import hashlib
+import marshal
+import threading
+import logging
+from array import array
+from bisect import bisect_right
+
+from code.dat_parser import iter_dat_games, iter_dat_chunk, is_compressed_dat, split_dat
+from code.process_pool import create_background_pool, get_background_workers, get_mp_context, terminate_pool
+
+logger = logging.getLogger('LRscript')
+
+# Formato dello snapshot: MAGIC + versione + header (impronta DAT, numero giochi)
+# non compresso + colonne e viste degli ordinamenti marshal compressi con zlib
+SNAPSHOT_MAGIC = b'LRCAT'
+SNAPSHOT_VERSION = 9
+SNAPSHOT_HEADER = struct.Struct('<5sBI')  # magic, versione, lunghezza header marshal
+SNAPSHOT_EXTENSION = '.catalog'
+
+# Lunghezza massima della descrizione mostrata nella lista giochi
+DISPLAY_DESCRIPTION_CHARS = 30
+
+# Ordinamenti della lista precalcolati nello snapshot (il primo è quello di default)
+SORT_ORDERS = ('name', 'description', 'year', 'manufacturer')
+DEFAULT_SORT_ORDER = SORT_ORDERS[0]
+
+# Oltre questa quota di giochi aggiunti/rimossi/modificati un DAT aggiornato
+# si ricompila da zero: applicare le differenze non sarebbe più conveniente
+INCREMENTAL_MAX_CHANGES = 0.25
+
+# Lettura parallela del DAT: blocchi per processo (più blocchi che processi
+# bilanciano il carico e limitano la memoria di ogni blocco) e dimensione
+# minima del DAT sotto la quale avviare i processi non conviene
+PARALLEL_CHUNKS_PER_WORKER = 4
+PARALLEL_MIN_DAT_SIZE = 16 * 1024 * 1024
+
+_DIGITS_RE = re.compile(r'(\d+)')
+
+
+def natural_key(text):
+    """Chiave di ordinamento naturale senza maiuscole: sf2 viene prima di sf10"""
+    parts = _DIGITS_RE.split(text.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+def get_game_hash(game):
+    """Hash a 64 bit del contenuto di un gioco del DAT: cambia se cambia un campo o una ROM"""
+    content = repr((game['name'], game['description'], game['year'], game['manufacturer'],
+                    game['cloneof'], game['size'], game.get('roms', 0), sorted(game.get('crcs', ()))))
+    return int.from_bytes(hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _insert_sorted(rows, row, key):
+    """Inserisce una riga in una lista di righe ordinata per key, dopo quelle con chiave uguale"""
+    row_key = key(row)
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        if row_key < key(rows[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    rows.insert(low, row)
+
+
+def invert_permutation(rows):
+    """Posizione di ogni riga in una permutazione: positions[riga] = posizione"""
+    positions = array('I', bytes(4 * len(rows)))
+    for position, row in enumerate(rows):
+        positions[row] = position
+    return positions
+
+
+def get_parallel_workers(xml_path, max_workers):
+    """Processi da usare per leggere il DAT in parallelo, 0 se conviene la lettura sequenziale"""
+    max_workers = get_background_workers(max_workers)
+    if max_workers < 2 or get_mp_context() is None:
+        return 0
+    try:
+        if os.path.getsize(xml_path) < PARALLEL_MIN_DAT_SIZE or is_compressed_dat(xml_path):
+            return 0
+    except OSError:
+        return 0
+    return max_workers
+
+
+def parse_catalog_chunk(xml_path, start, end, encoding):
+    """Legge un blocco del DAT in un catalogo parziale (eseguita in un processo separato)"""
+    catalog = GameCatalog()
+    for game in iter_dat_chunk(xml_path, start, end, encoding):
+        catalog.add_game(game)
+    return catalog
+
+
+def get_dat_fingerprint(xml_path):
+    """Calcola l'impronta del DAT (percorso, dimensione, data di modifica)"""
+    stat = os.stat(xml_path)
+    return (os.path.abspath(xml_path), stat.st_size, stat.st_mtime_ns)
+
+
+def get_snapshot_path(cache_path):
+    """Percorso dello snapshot accanto alla cartella cache della piattaforma"""
+    return os.path.normpath(cache_path) + SNAPSHOT_EXTENSION
+
+
+def _read_snapshot_header(f):
+    """Legge l'header di uno snapshot aperto, None se formato diverso"""
+    prefix = f.read(SNAPSHOT_HEADER.size)
+    if len(prefix) < SNAPSHOT_HEADER.size:
+        return None
+    magic, version, header_size = SNAPSHOT_HEADER.unpack(prefix)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    fingerprint, count = marshal.loads(f.read(header_size))
+    return tuple(fingerprint), count
+
+
+def read_snapshot_header(snapshot_path):
+    """Ritorna (impronta DAT, numero giochi) dello snapshot senza caricare le colonne"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            return _read_snapshot_header(f)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+
+def is_snapshot_current(snapshot_path, fingerprint):
+    """True se lo snapshot esiste ed è stato compilato dal DAT con questa impronta"""
+    header = read_snapshot_header(snapshot_path)
+    return header is not None and header[0] == tuple(fingerprint)
+
+
+class JumpIndex:
+    """Inizio di ogni sezione (lettera iniziale o anno) di una lista ordinata.
+
+    positions[i] è la posizione nella lista dove inizia la sezione labels[i]:
+    le sezioni sono poche decine, quindi un salto è una ricerca binaria su
+    un array minuscolo, indipendente dalla lunghezza della lista.
+    """
+
+    def __init__(self, positions, labels):
+        self.positions = positions
+        self.labels = labels
+
+    def _section(self, position):
+        """Indice della sezione che contiene la posizione"""
+        return max(0, bisect_right(self.positions, position) - 1)
+
+    def get_label(self, position):
+        """Etichetta della sezione che contiene la posizione"""
+        return self.labels[self._section(position)] if self.labels else ''
+
+    def next_position(self, position):
+        """Inizio della sezione successiva, None se è l'ultima"""
+        section = self._section(position) + 1
+        return self.positions[section] if section < len(self.positions) else None
+
+    def previous_position(self, position):
+        """Inizio della sezione corrente o, se già lì, di quella precedente; None all'inizio"""
+        if not self.positions:
+            return None
+        section = self._section(position)
+        if self.positions[section] == position:
+            section -= 1
+        return self.positions[section] if section >= 0 else None
+
+    def shifted(self, position, count):
+        """Indice dopo l'inserimento (count > 0) o la rimozione (count < 0) di righe dopo la posizione.
+
+        Le righe inserite (es. cloni espansi) appartengono alla sezione della
+        riga che le precede: si spostano solo gli inizi delle sezioni successive.
+        """
+        start = bisect_right(self.positions, position)
+        positions = self.positions[:start]
+        positions.extend(section_start + count for section_start in self.positions[start:])
+        return JumpIndex(positions, self.labels)
+
+    def select(self, rows, key):
+        """Indice di una sottolista (es. filtri o ricerca) nello stesso ordine della lista completa.
+
+        key(riga) è la posizione della riga nella lista completa: l'inizio di
+        ogni sezione nella sottolista si trova per ricerca binaria, senza
+        scorrerla. Le sezioni senza righe nella sottolista sono omesse.
+        """
+        positions = array('I')
+        labels = []
+        low = 0
+        for section_start, label in zip(self.positions, self.labels):
+            high = len(rows)
+            while low < high:
+                middle = (low + high) // 2
+                if key(rows[middle]) < section_start:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low >= len(rows):
+                break
+            if positions and positions[-1] == low:
+                # La sezione precedente non ha righe: la riga appartiene a questa
+                labels[-1] = label
+            else:
+                positions.append(low)
+                labels.append(label)
+        return JumpIndex(positions, labels)
+
+
+class CatalogDelta:
+    """Differenze tra il catalogo di un DAT aggiornato e lo snapshot precedente.
+
+    added e changed sono righe del nuovo catalogo, removed sono nomi ROM
+    presenti solo nel catalogo precedente.
+    """
+
+    def __init__(self, previous_fingerprint, added, removed, changed):
+        self.previous_fingerprint = previous_fingerprint
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def summary(self):
+        """Riepilogo leggibile delle modifiche"""
+        return f"{len(self.added)} nuovi, {len(self.removed)} rimossi, {len(self.changed)} modificati"
+
+
+class GameCatalog:
+    """Catalogo giochi memorizzato per colonne.
+
+    Ogni gioco è una riga identificata dal suo indice: le liste di testo
+    contengono solo i campi del DAT, anni/produttori/parent sono stringhe
+    internate (condivise tra le righe) e i dati numerici stanno in array.
+    I CRC delle ROM di tutti i giochi sono in un unico array: crc_ends[riga]
+    è la posizione dove finiscono quelli della riga.
+    """
+
+    COLUMNS = ('names', 'descriptions', 'years', 'manufacturers', 'parents', 'sizes', 'hashes',
+               'rom_counts', 'crcs', 'crc_ends')
+    # Colonne numeriche serializzate come bytes dell'array
+    ARRAY_COLUMNS = {'sizes': 'Q', 'hashes': 'Q', 'rom_counts': 'I', 'crcs': 'I', 'crc_ends': 'I'}
+
+    def __init__(self, fingerprint=None):
+        self.fingerprint = fingerprint
+        self.names = []
+        self.descriptions = []
+        self.years = []
+        self.manufacturers = []
+        self.parents = []
+        self.sizes = array('Q')
+        self.hashes = array('Q')  # Hash del contenuto di ogni gioco (vedi get_game_hash)
+        self.rom_counts = array('I')  # Numero di <rom> di ogni gioco
+        self.crcs = array('I')        # CRC32 delle ROM di tutti i giochi, riga dopo riga
+        self.crc_ends = array('I')    # Fine dei CRC di ogni riga in self.crcs
+        self.index = {}  # rom_name -> indice riga, costruito una sola volta al caricamento
+        self.clones = {}  # riga parent -> array delle righe dei cloni (vedi group_clones)
+        self.orders = {}  # ordinamento -> permutazione delle righe (array), salvata nello snapshot
+        self.parent_orders = {}  # ordinamento -> righe dei soli parent (vista raggruppata), nello snapshot
+        self.positions = {}  # ordinamento -> posizione di ogni riga nella permutazione, nello snapshot
+        self.jump_indexes = {}  # ordinamento -> (JumpIndex di tutte le righe, JumpIndex dei parent), nello snapshot
+        self.delta = None  # CatalogDelta rispetto allo snapshot precedente (DAT aggiornato)
+
+    def __len__(self):
+        return len(self.names)
+
+    def build_index(self):
+        """Ricostruisce l'indice rom_name -> riga"""
+        self.index = {name: row for row, name in enumerate(self.names)}
+
+    def get_row(self, rom_name):
+        """Ritorna l'indice riga di un nome ROM, None se assente"""
+        return self.index.get(rom_name)
+
+    def get_record(self, row):
+        """Ritorna i campi di una riga del catalogo"""
+        return {
+            'name': self.names[row],
+            'description': self.descriptions[row],
+            'year': self.years[row],
+            'manufacturer': self.manufacturers[row],
+            'cloneof': self.parents[row],
+            'size': self.sizes[row],
+            'roms': self.rom_counts[row],
+            'crcs': self.get_crcs(row)
+        }
+
+    def get_crcs(self, row):
+        """CRC32 delle ROM di una riga, nell'ordine del DAT"""
+        start = self.crc_ends[row - 1] if row else 0
+        return list(self.crcs[start:self.crc_ends[row]])
+
+    def estimate_memory(self):
+        """Stima dei byte occupati dal catalogo (stringhe, liste, array, indice e viste degli ordinamenti)"""
+        text_size = sum(map(len, self.names)) + sum(map(len, self.descriptions))
+        # Oggetto stringa (~50 byte) per nomi e descrizioni, puntatori nelle 5 liste, voce dell'indice
+        per_row = 2 * 50 + 5 * 8 + 100
+        arrays = [getattr(self, column) for column in self.ARRAY_COLUMNS]
+        for views in (self.orders, self.parent_orders, self.positions):
+            arrays.extend(views.values())
+        return text_size + per_row * len(self) + sum(values.itemsize * len(values) for values in arrays)
+
+    def find(self, rom_name):
+        """Cerca un gioco per nome ROM in O(1), None se assente"""
+        row = self.index.get(rom_name)
+        if row is None:
+            return None
+        return self.get_record(row)
+
+    def display_text(self, row):
+        """Testo della lista giochi derivato dalla riga (Nome_rom - Descrizione troncata)"""
+        description = self.descriptions[row]
+        if len(description) > DISPLAY_DESCRIPTION_CHARS:
+            description = description[:DISPLAY_DESCRIPTION_CHARS] + "..."
+        return f"{self.names[row]} - {description}"
+
+    def get_sort_key(self, order, row, description_key=None):
+        """Chiave naturale di una riga per un ordinamento.
+
+        Anno e produttore sconosciuti vanno in fondo, a parità di valore si
+        ordina per descrizione (description_key evita di ricalcolarla).
+        """
+        if order == 'name':
+            return natural_key(self.names[row])
+        if description_key is None:
+            description_key = natural_key(self.descriptions[row])
+        if order == 'year':
+            year = self.years[row]
+            return (not year, year, description_key)
+        if order == 'manufacturer':
+            manufacturer = self.manufacturers[row]
+            return (not manufacturer, manufacturer.lower(), description_key)
+        return description_key
+
+    def build_orders(self):
+        """Calcola le permutazioni mancanti di tutti gli ordinamenti con chiavi naturali.
+
+        Ogni chiave è calcolata una sola volta per riga (niente lambda che
+        ricostruisce stringhe a ogni confronto). Per ogni ordinamento si
+        calcolano anche la lista dei soli parent, le posizioni inverse e le
+        sezioni per i salti (lettere o anni): cambiare ordine o saltare
+        nell'interfaccia non scorre mai il catalogo.
+        """
+        missing = [order for order in SORT_ORDERS if order not in self.orders]
+        if missing:
+            rows = range(len(self))
+            description_keys = [natural_key(description) for description in self.descriptions]
+            for order in missing:
+                keys = [self.get_sort_key(order, row, description_keys[row]) for row in rows]
+                self.orders[order] = array('I', sorted(rows, key=keys.__getitem__))
+        for order in SORT_ORDERS:
+            if order not in self.parent_orders:
+                self.parent_orders[order] = self.filter_parents(self.orders[order])
+            if order not in self.positions:
+                self.positions[order] = invert_permutation(self.orders[order])
+            if order not in self.jump_indexes:
+                self.jump_indexes[order] = (self.build_jump_index(self.orders[order], order),
+                                            self.build_jump_index(self.parent_orders[order], order))
+
+    def get_jump_label(self, order, row):
+        """Sezione di una riga per i salti nella lista: anno oppure iniziale maiuscola ('#' per cifre e simboli)"""
+        if order == 'year':
+            return self.years[row] or '?'
+        if order == 'manufacturer':
+            text = self.manufacturers[row]
+            if not text:
+                return '?'
+        elif order == 'description':
+            text = self.descriptions[row]
+        else:
+            text = self.names[row]
+        initial = text[:1].upper()
+        return initial if initial.isalpha() else '#'
+
+    def build_jump_index(self, rows, order):
+        """Costruisce con un solo passaggio l'indice delle sezioni di una lista di righe ordinata.
+
+        Per le viste del catalogo gli indici sono precalcolati (vedi get_jump_index):
+        serve solo per liste in un ordine diverso, come i risultati per pertinenza.
+        """
+        positions = array('I')
+        labels = []
+        previous = None
+        for position, row in enumerate(rows):
+            label = self.get_jump_label(order, row)
+            if label != previous:
+                positions.append(position)
+                labels.append(label)
+                previous = label
+        return JumpIndex(positions, labels)
+
+    def diff(self, previous):
+        """Confronta il catalogo con quello di un DAT precedente per nome ROM e hash del contenuto"""
+        added = []
+        changed = []
+        for row, name in enumerate(self.names):
+            previous_row = previous.index.get(name)
+            if previous_row is None:
+                added.append(row)
+            elif previous.hashes[previous_row] != self.hashes[row]:
+                changed.append(row)
+        removed = [name for name in previous.names if name not in self.index]
+        return CatalogDelta(previous.fingerprint, added, removed, changed)
+
+    def update_orders(self, previous, delta):
+        """Deriva gli ordinamenti da quelli del catalogo precedente.
+
+        I giochi invariati mantengono la loro posizione relativa (le chiavi non
+        sono cambiate): si rimappano le righe e si inseriscono per ricerca
+        binaria solo i giochi nuovi o modificati, invece di riordinare tutto.
+        """
+        inserted = delta.added + delta.changed
+        skipped = set(inserted)
+        row_map = [self.index.get(name, -1) for name in previous.names]
+        row_map = [-1 if row in skipped else row for row in row_map]
+        for order in SORT_ORDERS:
+            rows = [row_map[row] for row in previous.get_order(order) if row_map[row] >= 0]
+            cache = {}
+
+            def key(row):
+                row_key = cache.get(row)
+                if row_key is None:
+                    row_key = cache[row] = self.get_sort_key(order, row)
+                return row_key
+
+            for row in inserted:
+                _insert_sorted(rows, row, key)
+            self.orders[order] = array('I', rows)
+            # Parent e posizioni dipendono da tutte le righe: li ricalcola build_orders()
+            self.parent_orders.pop(order, None)
+            self.positions.pop(order, None)
+            self.jump_indexes.pop(order, None)
+
+    def apply_previous_snapshot(self, snapshot_path):
+        """Confronta il catalogo appena letto dal DAT con lo snapshot precedente.
+
+        Se le differenze sono poche gli ordinamenti si aggiornano solo per i
+        giochi cambiati e self.delta permette all'indice FTS5 su disco di fare
+        lo stesso. Gli indici in memoria (prefissi, trigrammi, faccette) non
+        usano il delta e si ricostruiscono per intero. Ritorna il CatalogDelta,
+        None se non c'è uno snapshot precedente utilizzabile.
+        """
+        previous = GameCatalog.load_snapshot(snapshot_path)
+        if previous is None or previous.fingerprint == tuple(self.fingerprint or ()):
+            return None
+
+        delta = self.diff(previous)
+        logger.info(f"DAT aggiornato ({snapshot_path}): {delta.summary()}")
+        if len(delta) <= len(self) * INCREMENTAL_MAX_CHANGES:
+            self.update_orders(previous, delta)
+            self.delta = delta
+        return delta
+
+    def get_order(self, order=DEFAULT_SORT_ORDER):
+        """Righe nell'ordinamento richiesto (permutazione precalcolata)"""
+        if order not in self.orders:
+            self.build_orders()
+        return self.orders[order]
+
+    def get_jump_index(self, order=DEFAULT_SORT_ORDER, parents=False):
+        """Indice precalcolato delle sezioni della vista di un ordinamento (tutte le righe o soli parent)"""
+        if order not in self.jump_indexes:
+            self.build_orders()
+        return self.jump_indexes[order][1 if parents else 0]
+
+    def get_view(self, order=DEFAULT_SORT_ORDER):
+        """Vista precalcolata di un ordinamento: (righe, righe dei soli parent, posizione di ogni riga)"""
+        if order not in self.positions:
+            self.build_orders()
+        return self.orders[order], self.parent_orders[order], self.positions[order]
+
+    def get_parent_row(self, row):
+        """Riga del parent di un clone, None se la riga non è un clone (o il parent manca nel DAT)"""
+        parent = self.parents[row]
+        if not parent:
+            return None
+        return self.index.get(parent)
+
+    def filter_parents(self, rows):
+        """Righe (già ordinate) che non sono cloni, nello stesso ordine"""
+        return array('I', [row for row in rows if self.get_parent_row(row) is None])
+
+    def group_clones(self, rows):
+        """Separa righe già ordinate in parent e cloni.
+
+        Ritorna le sole righe dei parent nello stesso ordine e riempie
+        self.clones con i cloni di ogni parent, anch'essi in quell'ordine.
+        I cloni il cui parent non è nel DAT restano nella lista dei parent.
+        """
+        parent_rows = array('I')
+        clones = {}
+        for row in rows:
+            parent_row = self.get_parent_row(row)
+            if parent_row is None:
+                parent_rows.append(row)
+            else:
+                children = clones.get(parent_row)
+                if children is None:
+                    children = clones[parent_row] = array('I')
+                children.append(row)
+        self.clones = clones
+        return parent_rows
+
+    def add_game(self, game):
+        """Aggiunge un gioco letto dal DAT"""
+        self.index[game['name']] = len(self.names)
+        self.names.append(game['name'])
+        self.descriptions.append(game['description'])
+        # Anni, produttori e parent si ripetono migliaia di volte: una sola copia in memoria
+        self.years.append(sys.intern(game['year']))
+        self.manufacturers.append(sys.intern(game['manufacturer']))
+        self.parents.append(sys.intern(game['cloneof']))
+        self.sizes.append(game['size'])
+        self.hashes.append(get_game_hash(game))
+        self.rom_counts.append(game.get('roms', 0))
+        self.crcs.extend(game.get('crcs', ()))
+        self.crc_ends.append(len(self.crcs))
+
+    def extend(self, other):
+        """Accoda le righe di un catalogo parziale (blocco successivo dello stesso DAT)"""
+        crc_offset = len(self.crcs)
+        for row, name in enumerate(other.names, len(self.names)):
+            self.index[name] = row
+        self.names.extend(other.names)
+        self.descriptions.extend(other.descriptions)
+        # Le stringhe arrivano da un altro processo: si internano di nuovo qui
+        self.years.extend(map(sys.intern, other.years))
+        self.manufacturers.extend(map(sys.intern, other.manufacturers))
+        self.parents.extend(map(sys.intern, other.parents))
+        self.sizes.extend(other.sizes)
+        self.hashes.extend(other.hashes)
+        self.rom_counts.extend(other.rom_counts)
+        self.crcs.extend(other.crcs)
+        self.crc_ends.extend(end + crc_offset for end in other.crc_ends)
+
+    def read_dat_parallel(self, xml_path, workers, executor=None):
+        """Legge il DAT dividendolo in blocchi letti da un pool di processi.
+
+        I blocchi sono accodati nell'ordine del file, quindi il catalogo è
+        identico a quello della lettura sequenziale. È un generatore: dopo
+        ogni blocco accodato restituisce il numero di righe complete, così
+        chi lo usa può pubblicarle o interrompere la lettura. Il pool può
+        essere creato da chi legge, per terminarlo da un altro thread; in
+        ogni caso è chiuso alla fine della lettura.
+        """
+        encoding, chunks = split_dat(xml_path, workers * PARALLEL_CHUNKS_PER_WORKER)
+        logger.info(f"Lettura parallela di {xml_path}: {len(chunks)} blocchi su {workers} processi")
+        if executor is None:
+            executor = create_background_pool(workers, get_mp_context())
+        try:
+            futures = [executor.submit(parse_catalog_chunk, xml_path, start, end, encoding)
+                       for start, end in chunks]
+            for future in futures:
+                self.extend(future.result())
+                yield len(self)
+        finally:
+            # Lettura interrotta: i blocchi ancora in corso non servono più
+            terminate_pool(executor)
+
+    @classmethod
+    def from_dat(cls, xml_path, max_workers=1):
+        """Costruisce il catalogo leggendo il DAT in streaming (in parallelo se max_workers != 1)"""
+        catalog = cls(get_dat_fingerprint(xml_path))
+        workers = get_parallel_workers(xml_path, max_workers) if max_workers != 1 else 0
+        if workers:
+            for _ in catalog.read_dat_parallel(xml_path, workers):
+                pass
+            return catalog
+        for game in iter_dat_games(xml_path):
+            catalog.add_game(game)
+        return catalog
+
+    def save_snapshot(self, snapshot_path):
+        """Salva il catalogo in uno snapshot binario compatto"""
+        try:
+            folder = os.path.dirname(snapshot_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+
+            columns = []
+            for column in self.COLUMNS:
+                values = getattr(self, column)
+                columns.append(values.tobytes() if column in self.ARRAY_COLUMNS else values)
+            # Gli ordinamenti (con parent, posizioni e sezioni) sono compilati una volta qui:
+            # cambiare ordine non riordina mai
+            self.build_orders()
+            views = tuple((self.orders[order].tobytes(), self.parent_orders[order].tobytes(),
+                           self.positions[order].tobytes(),
+                           tuple((jump_index.positions.tobytes(), tuple(jump_index.labels))
+                                 for jump_index in self.jump_indexes[order]))
+                          for order in SORT_ORDERS)
+            header = marshal.dumps((self.fingerprint, len(self)))
+            payload = marshal.dumps((tuple(columns), views))
+
+            # Scrittura atomica: un file a metà non deve mai sostituire uno snapshot valido.
+            # Il nome temporaneo è univoco perché preload e caricamento possono scrivere insieme
+            tmp_path = f"{snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+                f.write(header)
+                f.write(zlib.compress(payload, 1))
+            os.replace(tmp_path, snapshot_path)
+            logger.info(f"Snapshot catalogo salvato: {snapshot_path} ({len(self)} giochi)")
+            return True
+        except Exception as e:
+            logger.error(f"Errore salvataggio snapshot {snapshot_path}: {e}")
+            return False
+
+    @classmethod
+    def load_snapshot(cls, snapshot_path, fingerprint=None):
+        """Carica lo snapshot se esiste e corrisponde all'impronta del DAT (qualsiasi se None)"""
+        if not os.path.exists(snapshot_path):
+            return None
+        try:
+            with open(snapshot_path, 'rb') as f:
+                header = _read_snapshot_header(f)
+                if header is None:
+                    logger.info(f"Snapshot {snapshot_path} di formato diverso, da ricostruire")
+                    return None
+
+                stored_fingerprint, count = header
+                if fingerprint is not None and stored_fingerprint != tuple(fingerprint):
+                    logger.info(f"DAT modificato, snapshot {snapshot_path} da ricostruire")
+                    return None
+
+                columns, views = marshal.loads(zlib.decompress(f.read()))
+
+            catalog = cls(stored_fingerprint)
+            for column, values in zip(cls.COLUMNS, columns):
+                if column in cls.ARRAY_COLUMNS:
+                    values = array(cls.ARRAY_COLUMNS[column], values)
+                setattr(catalog, column, values)
+            for order, (rows, parent_rows, positions, jump_indexes) in zip(SORT_ORDERS, views):
+                catalog.orders[order] = array('I', rows)
+                catalog.parent_orders[order] = array('I', parent_rows)
+                catalog.positions[order] = array('I', positions)
+                catalog.jump_indexes[order] = tuple(JumpIndex(array('I', sections), list(labels))
+                                                    for sections, labels in jump_indexes)
+            catalog.build_index()
+            return catalog
+        except Exception as e:
+            logger.warning(f"Snapshot {snapshot_path} non leggibile: {e}")
+            return None
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Game Facets
+======================
+Filtri della lista giochi per decennio, produttore, genere e cloni con
+bitmap precalcolate per ogni valore.
+"""
+
+import os
+import sys
+import logging
+from array import array
+
+logger = logging.getLogger('LRscript')
+
+# Valore usato per anni, produttori e generi assenti
+UNKNOWN_VALUE = '?'
+
+FACETS = ('decade', 'manufacturer', 'genre')
+
+
+def get_decade(year):
+    """Decennio di un anno del DAT ("1991" e "199?" -> "1990"), '?' se sconosciuto"""
+    if len(year) >= 3 and year[:3].isdigit():
+        return year[:3] + '0'
+    return UNKNOWN_VALUE
+
+
+def load_catver(catver_path):
+    """Legge la sezione [Category] di catver.ini: rom_name -> genere principale.
+
+    Le categorie hanno la forma "Fighter / Versus * Mature *": come genere si
+    tiene solo la prima parte, così i valori restano pochi e scorribili.
+    """
+    genres = {}
+    in_category = False
+    with open(catver_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(';'):
+                continue
+            if line.startswith('['):
+                in_category = line.lower() == '[category]'
+                continue
+            if in_category and '=' in line:
+                rom_name, category = line.split('=', 1)
+                genre = category.split('/')[0].replace('* Mature *', '').strip()
+                if genre:
+                    genres[rom_name.strip()] = sys.intern(genre)
+    return genres
+
+
+def _rows_to_bitmap(rows, size_bytes):
+    """Converte una lista di righe in una bitmap (int, bit i = riga i)"""
+    bits = bytearray(size_bytes)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class CatalogFacets:
+    """Bitmap per ogni valore di decennio, produttore e genere del catalogo.
+
+    Ogni bitmap è un int Python con un bit per riga: un filtro combinato
+    ("Capcom AND 1990 AND non clone") è un AND di pochi int, eseguito in
+    microsecondi anche su 40k giochi. Le bitmap si calcolano una sola volta
+    per catalogo.
+    """
+
+    def __init__(self, catver_path=None):
+        self.catver_path = catver_path
+        self.bitmaps = {facet: {} for facet in FACETS}  # faccetta -> valore -> bitmap
+        self.clones = 0      # Bitmap dei cloni con parent nel DAT
+        self.all_rows = 0    # Bitmap di tutte le righe
+        self.size_bytes = 0
+        self.ready = False
+
+    def build(self, catalog):
+        """Calcola le bitmap di tutte le faccette del catalogo"""
+        genres = {}
+        if self.catver_path and os.path.exists(self.catver_path):
+            try:
+                genres = load_catver(self.catver_path)
+                logger.info(f"Generi caricati da {self.catver_path}: {len(genres)} giochi")
+            except OSError as e:
+                logger.warning(f"Errore lettura {self.catver_path}: {e}")
+
+        count = len(catalog)
+        self.size_bytes = (count + 7) // 8
+        columns = {
+            'decade': [get_decade(year) for year in catalog.years],
+            'manufacturer': [manufacturer or UNKNOWN_VALUE for manufacturer in catalog.manufacturers],
+            'genre': [genres.get(name, UNKNOWN_VALUE) for name in catalog.names]
+        }
+        bitmaps = {}
+        for facet, values in columns.items():
+            rows_by_value = {}
+            for row, value in enumerate(values):
+                rows = rows_by_value.get(value)
+                if rows is None:
+                    rows = rows_by_value[value] = []
+                rows.append(row)
+            bitmaps[facet] = {value: _rows_to_bitmap(rows, self.size_bytes) for value, rows in rows_by_value.items()}
+
+        clone_rows = [row for row in range(count) if catalog.get_parent_row(row) is not None]
+        self.clones = _rows_to_bitmap(clone_rows, self.size_bytes)
+        self.all_rows = (1 << count) - 1
+        self.bitmaps = bitmaps
+        self.ready = True
+        logger.info(f"Faccette costruite: {len(bitmaps['decade'])} decenni, "
+                    f"{len(bitmaps['manufacturer'])} produttori, {len(bitmaps['genre'])} generi")
+
+    def get_values(self, facet):
+        """Valori di una faccetta: decenni e generi in ordine, produttori dal più frequente"""
+        bitmaps = self.bitmaps[facet]
+        if facet == 'manufacturer':
+            return sorted(bitmaps, key=lambda value: (-bin(bitmaps[value]).count('1'), value.lower()))
+        return sorted(bitmaps, key=str.lower)
+
+    def filter(self, decade=None, manufacturer=None, genre=None, clones=True):
+        """Bitmap delle righe che soddisfano tutti i filtri indicati (None = nessun filtro)"""
+        mask = self.all_rows
+        for facet, value in (('decade', decade), ('manufacturer', manufacturer), ('genre', genre)):
+            if value is not None:
+                mask &= self.bitmaps[facet].get(value, 0)
+        if not clones:
+            mask &= ~self.clones
+        return mask
+
+    def select(self, mask, rows, positions=None):
+        """Righe di una vista ordinata (array di righe) presenti nella bitmap, nello stesso ordine.
+
+        positions (riga -> posizione nella vista) permette, quando i risultati
+        sono pochi, di leggere solo i bit attivi e ordinarli invece di
+        scorrere tutta la vista. La bitmap deve contenere solo righe della vista.
+        """
+        mask_bytes = mask.to_bytes(self.size_bytes, 'little')
+        if positions is not None and bin(mask).count('1') <= len(rows) // 8:
+            selected = [index * 8 + bit for index, byte in enumerate(mask_bytes) if byte
+                        for bit in range(8) if byte >> bit & 1]
+            return array('I', sorted(selected, key=positions.__getitem__))
+        return array('I', [row for row in rows if mask_bytes[row >> 3] >> (row & 7) & 1])
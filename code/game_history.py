@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Game History
+=======================
+Descrizioni dei giochi lette in locale da history.dat, mameinfo.dat e
+command.dat: ogni file è indicizzato una volta sola in una tabella di offset
+(salvata in cache) e letto con accesso diretto tramite mmap.
+"""
+
+import os
+import re
+import mmap
+import marshal
+import threading
+import logging
+from array import array
+
+logger = logging.getLogger('LRscript')
+
+# Cartella degli indici degli offset: file accanto agli snapshot, non cancellati alla chiusura
+HISTORY_CACHE_PATH = "./cache"
+
+# Versione del formato dell'indice su disco
+HISTORY_INDEX_VERSION = 1
+
+# Inizio di una voce: "$info=rom1,rom2," a inizio riga (le voci di console come "$nes=" sono ignorate)
+INFO_PATTERN = re.compile(rb'^\$info=([^\r\n]*)', re.MULTILINE)
+END_MARKER = b'\n$end'
+
+
+def get_history_fingerprint(dat_path):
+    """Impronta del file (percorso, dimensione, data di modifica) usata per validare l'indice"""
+    stat = os.stat(dat_path)
+    return (os.path.abspath(dat_path), stat.st_size, stat.st_mtime_ns)
+
+
+def _skip_tag_lines(data, offset, end):
+    """Salta le righe di intestazione della voce ($bio, $mame, $cmd, link) e le righe vuote iniziali"""
+    while offset < end:
+        line_end = data.find(b'\n', offset, end)
+        if line_end < 0:
+            line_end = end
+        line = data[offset:line_end].strip()
+        if line and not line.startswith(b'$'):
+            break
+        offset = line_end + 1
+    return offset
+
+
+def index_history_dat(data):
+    """Tabella degli offset di un file in formato history.dat.
+
+    Ritorna (nomi, offset, lunghezze): per ogni nome ROM la posizione e la
+    lunghezza in byte del testo della sua voce (tra l'intestazione e $end).
+    """
+    names = []
+    offsets = array('Q')
+    lengths = array('I')
+    for match in INFO_PATTERN.finditer(data):
+        end = data.find(END_MARKER, match.end())
+        if end < 0:
+            break
+        start = _skip_tag_lines(data, match.end() + 1, end)
+        if start >= end:
+            continue
+        for name in match.group(1).split(b','):
+            name = name.strip()
+            if name:
+                names.append(name.decode('ascii', 'replace'))
+                offsets.append(start)
+                lengths.append(end - start)
+    return names, offsets, lengths
+
+
+class HistoryDat:
+    """Un file history.dat (o mameinfo.dat, command.dat) con il suo indice degli offset"""
+
+    def __init__(self, dat_path, cache_folder=HISTORY_CACHE_PATH):
+        self.dat_path = dat_path
+        self.index_path = os.path.join(cache_folder, os.path.basename(dat_path) + ".idx")
+        self.index = {}  # nome ROM -> posizione nelle tabelle degli offset
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self.file = None
+        self.data = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def load(self):
+        """Apre il file in mmap e carica l'indice salvato, o lo ricostruisce se il file è cambiato"""
+        fingerprint = get_history_fingerprint(self.dat_path)
+        self.file = open(self.dat_path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if not self._load_index(fingerprint):
+            names, self.offsets, self.lengths = index_history_dat(self.data)
+            self._set_names(names)
+            self._save_index(fingerprint, names)
+            logger.info(f"Indicizzato {self.dat_path}: {len(self.index)} giochi")
+
+    def _set_names(self, names):
+        """Dizionario nome -> posizione (a parità di nome vale la prima voce del file)"""
+        index = {}
+        for position, name in enumerate(names):
+            index.setdefault(name, position)
+        self.index = index
+
+    def _load_index(self, fingerprint):
+        """Carica l'indice su disco se compilato da questa versione del file"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                version, stored_fingerprint, names, offsets, lengths = marshal.load(f)
+        except (OSError, ValueError, EOFError, TypeError):
+            return False
+        if version != HISTORY_INDEX_VERSION or tuple(stored_fingerprint) != fingerprint:
+            return False
+        self.offsets = array('Q', offsets)
+        self.lengths = array('I', lengths)
+        self._set_names(names)
+        logger.debug(f"Indice di {self.dat_path} caricato: {len(self.index)} giochi")
+        return True
+
+    def _save_index(self, fingerprint, names):
+        """Salva l'indice degli offset per i prossimi avvii"""
+        try:
+            folder = os.path.dirname(self.index_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            data = (HISTORY_INDEX_VERSION, fingerprint, tuple(names),
+                    self.offsets.tobytes(), self.lengths.tobytes())
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.warning(f"Errore salvataggio indice {self.index_path}: {e}")
+
+    def get_text(self, rom_name):
+        """Testo della voce del gioco, None se assente"""
+        position = self.index.get(rom_name)
+        if position is None or self.data is None:
+            return None
+        offset = self.offsets[position]
+        text = self.data[offset:offset + self.lengths[position]]
+        return text.decode('utf-8', 'replace').strip() or None
+
+    def close(self):
+        """Chiude mmap e file"""
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class GameHistory:
+    """Descrizioni locali dei giochi dai file history.dat, mameinfo.dat e command.dat presenti.
+
+    Gli indici si caricano in un thread all'avvio: finché non sono pronti
+    (o se nessun file è presente) get_description() ritorna None e si usa
+    il servizio online.
+    """
+
+    def __init__(self, dat_paths, cache_folder=HISTORY_CACHE_PATH):
+        self.dat_paths = dat_paths
+        self.cache_folder = cache_folder
+        self.sources = []
+        self.ready = False
+        self.thread = None
+
+    def start(self):
+        """Carica o costruisce gli indici in un thread separato"""
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _worker(self):
+        """Apre i file presenti, nell'ordine in cui compongono la descrizione"""
+        sources = []
+        for dat_path in self.dat_paths:
+            if not dat_path or not os.path.exists(dat_path):
+                continue
+            source = HistoryDat(dat_path, self.cache_folder)
+            try:
+                source.load()
+                sources.append(source)
+            except Exception as e:
+                logger.warning(f"Errore lettura {dat_path}: {e}")
+                source.close()
+        self.sources = sources
+        self.ready = True
+        if sources:
+            logger.info(f"Descrizioni locali: {', '.join(os.path.basename(s.dat_path) for s in sources)}")
+
+    def get_description(self, rom_name):
+        """Descrizione del gioco unendo le voci dei file locali, None se nessun file la contiene"""
+        if not self.ready:
+            return None
+        texts = []
+        for source in self.sources:
+            text = source.get_text(rom_name)
+            if text:
+                texts.append(text)
+        return "\n\n".join(texts) or None
+
+    def close(self):
+        """Chiude i file aperti (chiusura applicazione)"""
+        for source in self.sources:
+            source.close()
+        self.sources = []
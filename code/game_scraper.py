@@ -11,6 +11,8 @@ import requests
 import threading
 import logging
 
+from code.game_search import IncrementalSearch, tokenize_query
+
 logger = logging.getLogger('LRscript')
 
 class GameScraper:
@@ -20,26 +22,66 @@ class GameScraper:
         self.games_list = []
         self.current_game_index = 0
         self.search_text = ""
+        self.catalog = None       # Catalogo della piattaforma corrente
+        self.search_index = None  # Indice FTS5 del catalogo (CatalogSearchIndex)
+        self.incremental_search = None  # Ricerca durante la digitazione (IncrementalSearch)
+        self.trigram_index = None  # Indice per la ricerca approssimata (TrigramIndex)
+    
+    def set_catalog(self, catalog, search_index=None, prefix_index=None, trigram_index=None):
+        """Imposta il catalogo e gli indici di ricerca della piattaforma corrente"""
+        self.catalog = catalog
+        self.search_index = search_index
+        self.trigram_index = trigram_index
+        self.incremental_search = IncrementalSearch(prefix_index) if prefix_index is not None else None
+        
+    def search_games(self, search_term, limit=500, fuzzy=False):
+        """Cerca giochi nel catalogo e ritorna le righe ordinate per rilevanza.
+
+        Con fuzzy=True usa la somiglianza dei trigrammi, che trova anche
+        titoli scritti male ("strret fighter", "metalslug").
+        """
+        if not search_term.strip() or self.catalog is None:
+            return []
         
-    def search_games(self, search_term):
-        """Cerca giochi basandosi sul termine di ricerca"""
-        if not search_term.strip():
+        if fuzzy:
+            if self.trigram_index is not None and self.trigram_index.ready:
+                return self.trigram_index.search(search_term, limit)
             return []
         
-        # Simula ricerca - qui implementeresti la logica reale
-        # Per ora restituiamo una lista di esempio
-        return [
-            "10-yard fight (world, set 1)",
-            "1942 (rev. B)",
-            "1943: The Battle of Midway (rev. A)",
-            "1944: The Loop Master (USA)",
-            "Ace Driver: Victory Lap",
-            "After Burner",
-            "Alien vs Predator",
-            "Area 51",
-            "Asteroids",
-            "Battlezone"
-        ]
+        # Indice FTS5 se pronto, altrimenti scansione lineare del catalogo
+        if self.search_index is not None and self.search_index.ready:
+            try:
+                return self.search_index.search(search_term, limit)
+            except Exception as e:
+                logger.warning(f"Errore ricerca FTS, uso scansione lineare: {e}")
+        return self._scan_catalog(search_term, limit)
+    
+    def search_games_incremental(self, search_term):
+        """Ricerca a prefisso durante la digitazione, ritorna l'insieme delle righe trovate.
+
+        Ogni tasto raffina il risultato del tasto precedente; senza indice a
+        prefisso ricade sulla scansione lineare del catalogo.
+        """
+        if not search_term.strip() or self.catalog is None:
+            return set()
+        if self.incremental_search is not None:
+            return self.incremental_search.search(search_term)
+        return set(self._scan_catalog(search_term, len(self.catalog)))
+    
+    def _scan_catalog(self, search_term, limit):
+        """Ricerca lineare: tutte le parole devono comparire nel nome ROM o nella descrizione"""
+        tokens = tokenize_query(search_term)
+        if not tokens:
+            return []
+        catalog = self.catalog
+        results = []
+        for row in range(len(catalog)):
+            text = f"{catalog.names[row]} {catalog.descriptions[row]}".lower()
+            if all(token in text for token in tokens):
+                results.append(row)
+                if len(results) >= limit:
+                    break
+        return results
     
     def get_game_info(self, game_name):
         """Ottiene informazioni dettagliate su un gioco"""
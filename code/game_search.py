@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Game Search
+======================
+Indici di ricerca del catalogo: SQLite FTS5 persistente, indice a prefisso
+in memoria per la ricerca incrementale durante la digitazione e indice a
+trigrammi per la ricerca approssimata dei titoli scritti male.
+"""
+
+import os
+import re
+import heapq
+import hashlib
+import sqlite3
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # Facoltativo: senza numpy il punteggio dei trigrammi usa Counter
+
+logger = logging.getLogger('LRscript')
+
+SEARCH_DB_EXTENSION = '.search.db'
+SEARCH_DB_VERSION = '2'
+
+# Pesi bm25 per colonna: nome ROM e descrizione contano più di produttore e anno
+BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Quota minima dei trigrammi della ricerca che un titolo deve contenere per essere proposto
+FUZZY_MIN_COVERAGE = 0.5
+
+# Carattere più alto di Unicode: prefix + _MAX_CHAR chiude l'intervallo dei token con quel prefisso
+_MAX_CHAR = '\U0010ffff'
+
+
+def get_search_db_path(cache_path):
+    """Percorso del database di ricerca accanto alla cartella cache della piattaforma"""
+    return os.path.normpath(cache_path) + SEARCH_DB_EXTENSION
+
+
+def tokenize_query(query):
+    """Divide la ricerca in parole minuscole"""
+    return _TOKEN_RE.findall(query.lower())
+
+
+def get_trigrams(text):
+    """Insieme dei trigrammi di caratteri del testo.
+
+    Gli spazi e la punteggiatura sono rimossi prima del calcolo, così
+    "metalslug" e "Metal Slug" producono gli stessi trigrammi.
+    """
+    compact = ' ' + ''.join(tokenize_query(text)) + ' '
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def get_name_id(rom_name):
+    """Rowid FTS stabile di un nome ROM (intero SQLite a 64 bit con segno)"""
+    digest = hashlib.blake2b(rom_name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+class CatalogSearchIndex:
+    """Database SQLite con indice FTS5 su nome ROM, descrizione, produttore e anno.
+
+    Il rowid FTS deriva dal nome ROM e non dalla riga: così un DAT aggiornato
+    si applica cancellando e inserendo solo i giochi cambiati. Le ricerche
+    ritornano i nomi, convertiti in righe con l'indice del catalogo. Il
+    database resta su disco e si aggiorna solo se cambia l'impronta del DAT.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.ready = False
+        self.catalog = None
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Apre una nuova connessione al database"""
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # Timeout ampio: preload e caricamento possono costruire lo stesso database insieme
+        return sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+
+    def _get_meta(self, connection, key):
+        """Legge un valore dalla tabella meta, None se assente"""
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def is_current(self, fingerprint):
+        """True se il database è stato costruito dal DAT con questa impronta"""
+        if not os.path.exists(self.db_path):
+            return False
+        connection = self._connect()
+        try:
+            return (self._get_meta(connection, 'version') == SEARCH_DB_VERSION and
+                    self._get_meta(connection, 'fingerprint') == repr(tuple(fingerprint)))
+        finally:
+            connection.close()
+
+    def build(self, catalog):
+        """Costruisce, aggiorna con le differenze del DAT o riusa l'indice per il catalogo"""
+        self.catalog = catalog
+        if catalog.fingerprint is not None and self.is_current(catalog.fingerprint):
+            self.ready = True
+            logger.info(f"Indice di ricerca aggiornato: {self.db_path}")
+            return True
+        if catalog.delta is not None and self._apply_delta(catalog):
+            return True
+
+        # Durante la ricostruzione le ricerche usano la scansione lineare del catalogo
+        self.ready = False
+        try:
+            with self._lock:
+                self.close()
+            connection = self._connect()
+            try:
+                connection.executescript("""
+                    DROP TABLE IF EXISTS games_fts;
+                    DROP TABLE IF EXISTS meta;
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                    CREATE VIRTUAL TABLE games_fts USING fts5(
+                        name, description, manufacturer, year,
+                        tokenize = 'unicode61 remove_diacritics 2',
+                        prefix = '2 3'
+                    );
+                """)
+                connection.executemany(
+                    "INSERT INTO games_fts (rowid, name, description, manufacturer, year) VALUES (?, ?, ?, ?, ?)",
+                    zip(map(get_name_id, catalog.names), catalog.names, catalog.descriptions,
+                        catalog.manufacturers, catalog.years)
+                )
+                connection.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    [('version', SEARCH_DB_VERSION), ('fingerprint', repr(tuple(catalog.fingerprint or ())))]
+                )
+                connection.commit()
+            finally:
+                connection.close()
+            self.ready = True
+            logger.info(f"Indice di ricerca costruito: {self.db_path} ({len(catalog)} giochi)")
+            return True
+        except sqlite3.Error as e:
+            # Es. SQLite compilato senza FTS5: la ricerca userà la scansione lineare
+            logger.warning(f"Indice di ricerca non disponibile ({self.db_path}): {e}")
+            self.ready = False
+            return False
+
+    def _apply_delta(self, catalog):
+        """Applica al database solo i giochi aggiunti, rimossi e modificati del DAT aggiornato.
+
+        Possibile solo se il database corrisponde allo snapshot da cui è stato
+        calcolato il delta; altrimenti ritorna False e si ricostruisce tutto.
+        """
+        delta = catalog.delta
+        if not self.is_current(delta.previous_fingerprint):
+            return False
+
+        self.ready = False
+        try:
+            with self._lock:
+                self.close()
+            connection = self._connect()
+            try:
+                deleted = delta.removed + [catalog.names[row] for row in delta.changed]
+                connection.executemany("DELETE FROM games_fts WHERE rowid = ?",
+                                       [(get_name_id(name),) for name in deleted])
+                connection.executemany(
+                    "INSERT INTO games_fts (rowid, name, description, manufacturer, year) VALUES (?, ?, ?, ?, ?)",
+                    [(get_name_id(catalog.names[row]), catalog.names[row], catalog.descriptions[row],
+                      catalog.manufacturers[row], catalog.years[row]) for row in delta.added + delta.changed]
+                )
+                connection.execute("UPDATE meta SET value = ? WHERE key = 'fingerprint'",
+                                   (repr(tuple(catalog.fingerprint)),))
+                connection.commit()
+            finally:
+                connection.close()
+            self.ready = True
+            logger.info(f"Indice di ricerca aggiornato con le differenze del DAT: {self.db_path} ({delta.summary()})")
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Aggiornamento incrementale indice di ricerca fallito ({self.db_path}): {e}")
+            return False
+
+    def search(self, query, limit=500):
+        """Ritorna le righe del catalogo ordinate per rilevanza (bm25)"""
+        tokens = tokenize_query(query)
+        if not tokens or not self.ready or self.catalog is None:
+            return []
+
+        # Ogni parola è cercata come prefisso: "street fig" trova "Street Fighter"
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            cursor = self._connection.execute(
+                "SELECT name FROM games_fts WHERE games_fts MATCH ? "
+                "ORDER BY bm25(games_fts, ?, ?, ?, ?) LIMIT ?",
+                (match, *BM25_WEIGHTS, limit)
+            )
+            rows = [self.catalog.get_row(name) for name, in cursor]
+        return [row for row in rows if row is not None]
+
+    def close(self):
+        """Chiude la connessione usata per le ricerche"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class PrefixIndex:
+    """Indice a prefisso in memoria su nomi ROM e parole delle descrizioni.
+
+    I token distinti sono tenuti in una lista ordinata: tutti i token che
+    iniziano con un prefisso formano un intervallo contiguo trovato con due
+    bisect, e per ognuno c'è l'array ordinato delle righe che lo contengono.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        postings = {}
+        for row, (name, description) in enumerate(zip(catalog.names, catalog.descriptions)):
+            for token in set(tokenize_query(f"{name} {description}")):
+                rows = postings.get(token)
+                if rows is None:
+                    rows = postings[token] = array('I')
+                rows.append(row)
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+
+    def rows_for_prefix(self, prefix):
+        """Insieme delle righe con almeno un token che inizia con prefix"""
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + _MAX_CHAR, start)
+        rows = set()
+        for postings in self.postings[start:end]:
+            rows.update(postings)
+        return rows
+
+    def row_matches(self, row, prefixes):
+        """True se ogni prefisso è l'inizio di un token della riga"""
+        row_tokens = tokenize_query(f"{self.catalog.names[row]} {self.catalog.descriptions[row]}")
+        return all(any(token.startswith(prefix) for token in row_tokens) for prefix in prefixes)
+
+
+class IncrementalSearch:
+    """Ricerca durante la digitazione che raffina il risultato del tasto precedente.
+
+    Se la nuova ricerca estende la precedente (caratteri aggiunti o nuova
+    parola) i risultati sono un sottoinsieme di quelli già trovati: si
+    filtrano solo quelli. Le ricerche recenti restano in cache, così anche
+    il backspace è immediato.
+    """
+
+    SCAN_LIMIT = 300  # Sotto questa soglia si filtrano le righe, sopra si interseca l'indice
+    CACHE_SIZE = 64
+
+    def __init__(self, prefix_index):
+        self.index = prefix_index
+        self.cache = OrderedDict()  # tuple di token -> insieme di righe
+        self.last_tokens = None
+
+    def _refine(self, rows, prefixes):
+        """Restringe un insieme di righe ai soli che contengono tutti i prefissi"""
+        for position, prefix in enumerate(prefixes):
+            if len(rows) <= self.SCAN_LIMIT:
+                # Pochi candidati: controlla direttamente i token di ogni riga
+                remaining = prefixes[position:]
+                return {row for row in rows if self.index.row_matches(row, remaining)}
+            rows = rows & self.index.rows_for_prefix(prefix)
+        return rows
+
+    def search(self, query):
+        """Ritorna l'insieme delle righe che contengono tutte le parole come prefisso"""
+        tokens = tuple(tokenize_query(query))
+        if not tokens:
+            self.last_tokens = None
+            return set()
+
+        rows = self.cache.get(tokens)
+        if rows is not None:
+            self.cache.move_to_end(tokens)
+        else:
+            previous = self.last_tokens
+            if (previous and previous in self.cache and len(tokens) >= len(previous) and
+                    all(tokens[i].startswith(previous[i]) for i in range(len(previous)))):
+                # Estensione della ricerca precedente: filtra solo i token cambiati o nuovi
+                changed = [token for i, token in enumerate(tokens) if i >= len(previous) or token != previous[i]]
+                rows = self._refine(self.cache[previous], changed)
+            else:
+                # Nuova ricerca: parte dal token più lungo (intervallo più piccolo)
+                ordered = sorted(tokens, key=len, reverse=True)
+                rows = self._refine(self.index.rows_for_prefix(ordered[0]), ordered[1:])
+
+            self.cache[tokens] = rows
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+
+        self.last_tokens = tokens
+        return rows
+
+
+class TrigramIndex:
+    """Indice a trigrammi per la ricerca approssimata su nome ROM e descrizione.
+
+    Per ogni trigramma c'è l'array delle righe che lo contengono: il
+    punteggio di tutto il catalogo si ottiene contando in un'unica
+    operazione (numpy.bincount, o Counter senza numpy) quante volte ogni
+    riga compare nelle liste dei trigrammi della ricerca.
+    """
+
+    def __init__(self):
+        self.postings = {}              # trigramma -> array delle righe
+        self.trigram_counts = array('H')  # Numero di trigrammi di ogni riga
+        self.ready = False
+        self._sizes = None              # trigram_counts come array numpy
+
+    def build(self, catalog):
+        """Calcola i trigrammi di tutte le righe del catalogo"""
+        postings = {}
+        trigram_counts = array('H')
+        for row, (name, description) in enumerate(zip(catalog.names, catalog.descriptions)):
+            trigrams = get_trigrams(f"{name} {description}")
+            trigram_counts.append(min(len(trigrams), 0xFFFF))
+            for trigram in trigrams:
+                rows = postings.get(trigram)
+                if rows is None:
+                    rows = postings[trigram] = array('I')
+                rows.append(row)
+
+        self.postings = postings
+        self.trigram_counts = trigram_counts
+        if numpy is not None:
+            self._sizes = numpy.frombuffer(trigram_counts, dtype=numpy.uint16).astype(numpy.int64)
+        self.ready = True
+        logger.info(f"Indice trigrammi costruito: {len(catalog)} giochi, {len(postings)} trigrammi")
+
+    def search(self, query, limit=50):
+        """Ritorna le righe più simili alla ricerca, dalla più simile"""
+        query_trigrams = get_trigrams(query)
+        if not self.ready or len(query_trigrams) < 2:
+            return []
+
+        trigrams = [trigram for trigram in query_trigrams if trigram in self.postings]
+        if not trigrams:
+            return []
+        min_shared = max(1, round(len(query_trigrams) * FUZZY_MIN_COVERAGE))
+        if numpy is not None:
+            return self._score_numpy(trigrams, min_shared, limit)
+        return self._score_counter(trigrams, min_shared, limit)
+
+    def _score_numpy(self, trigrams, min_shared, limit):
+        """Punteggio vettoriale: un bincount su tutte le liste dei trigrammi"""
+        rows = numpy.concatenate([numpy.frombuffer(self.postings[t], dtype=numpy.uint32) for t in trigrams])
+        shared = numpy.bincount(rows, minlength=len(self.trigram_counts))
+        candidates = numpy.flatnonzero(shared >= min_shared)
+        if not len(candidates):
+            return []
+
+        # Più trigrammi in comune; a parità, il titolo più corto (meno trigrammi estranei)
+        scores = shared[candidates].astype(numpy.int64) * 0x10000 - self._sizes[candidates]
+        if len(candidates) > limit:
+            best = numpy.argpartition(-scores, limit)[:limit]
+            candidates, scores = candidates[best], scores[best]
+        return candidates[numpy.lexsort((candidates, -scores))].tolist()
+
+    def _score_counter(self, trigrams, min_shared, limit):
+        """Punteggio senza numpy: Counter sulle liste dei trigrammi"""
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self.postings[trigram])
+        sizes = self.trigram_counts
+        candidates = ((count * 0x10000 - sizes[row], -row) for row, count in shared.items() if count >= min_shared)
+        return [-row for _, row in heapq.nlargest(limit, candidates)]
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Gamelist Export
+==========================
+Scrittura del gamelist.xml di EmulationStation nella cartella roms_path di
+una piattaforma, con i dati già disponibili in LRscript (catalogo, descrizioni
+scaricate o locali, immagini in cache): nessuno scraping di rete ripetuto.
+"""
+
+import os
+import json
+import shutil
+import logging
+import xml.etree.ElementTree as ET
+
+from code.game_catalog import GameCatalog, get_snapshot_path
+from code.rom_index import get_rom_name
+
+logger = logging.getLogger('LRscript')
+
+GAMELIST_NAME = "gamelist.xml"
+MEDIA_FOLDER = "images"
+INFO_STORE_EXTENSION = ".info.json"
+
+# Immagini in cache -> (tag del gamelist, suffisso del file copiato in roms_path/images)
+MEDIA_TYPES = (
+    ('ingame', 'image', "-image.png"),
+    ('titolo', 'titleshot', "-titleshot.png"),
+)
+
+
+def get_info_store_path(cache_path):
+    """Percorso delle informazioni scaricate accanto alla cartella cache della piattaforma"""
+    return os.path.normpath(cache_path) + INFO_STORE_EXTENSION
+
+
+def format_release_date(year):
+    """Anno del DAT nel formato data di EmulationStation, None se incompleto (es. 198?)"""
+    year = (year or "").strip()
+    if len(year) == 4 and year.isdigit():
+        return f"{year}0101T000000"
+    return None
+
+
+class GameInfoStore:
+    """Informazioni dei giochi ottenute dal servizio online, salvate per la piattaforma.
+
+    Il file sta accanto agli snapshot (non nelle sottocartelle della cache,
+    svuotate alla chiusura), così le informazioni restano per l'esportazione.
+    """
+
+    FIELDS = ('name', 'description', 'year', 'manufacturer', 'clone_of')
+
+    def __init__(self, cache_path):
+        self.path = get_info_store_path(cache_path)
+        self.games = None  # nome ROM -> dizionario dei campi, letto al primo uso
+        self.dirty = False  # True se ci sono informazioni non ancora salvate
+
+    def load(self):
+        """Legge il file se non già letto"""
+        if self.games is not None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.games = json.load(f)
+        except (OSError, ValueError):
+            self.games = {}
+
+    def get(self, rom_name):
+        """Informazioni salvate del gioco, None se mai scaricate"""
+        self.load()
+        return self.games.get(rom_name)
+
+    def put(self, rom_name, info):
+        """Memorizza le informazioni di un gioco (scritte su disco con save())"""
+        self.load()
+        self.games[rom_name] = {field: info.get(field, "") for field in self.FIELDS}
+        self.dirty = True
+
+    def save(self):
+        """Salva il file se ci sono informazioni nuove (cambio piattaforma o chiusura)"""
+        if not self.dirty:
+            return
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.games, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"Errore salvataggio informazioni {self.path}: {e}")
+
+
+class GamelistExporter:
+    """Crea o aggiorna il gamelist.xml di roms_path in un solo passaggio.
+
+    Sono esportate solo le ROM presenti nella cartella. I campi già valorizzati
+    nel gamelist (scraping di EmulationStation o modifiche a mano) non vengono
+    sovrascritti: si aggiungono i giochi mancanti e si completano i campi vuoti.
+    """
+
+    def __init__(self, platform, history=None):
+        self.platform = platform
+        self.roms_path = platform['roms_path']
+        self.cache_path = platform['path']
+        self.history = history
+        self.gamelist_path = os.path.join(self.roms_path, GAMELIST_NAME)
+        self.media_path = os.path.join(self.roms_path, MEDIA_FOLDER)
+
+    def load_gamelist(self):
+        """Radice del gamelist esistente (o nuova), None se il file esiste ma non è leggibile"""
+        if not os.path.exists(self.gamelist_path):
+            return ET.Element('gameList')
+        try:
+            return ET.parse(self.gamelist_path).getroot()
+        except ET.ParseError as e:
+            logger.warning(f"{self.gamelist_path} non leggibile, non viene modificato: {e}")
+            return None
+
+    def get_media(self, rom_name):
+        """Immagini del gioco in roms_path/images, copiate dalla cache se non già presenti"""
+        media = {}
+        for cache_folder, tag, suffix in MEDIA_TYPES:
+            filename = rom_name + suffix
+            target = os.path.join(self.media_path, filename)
+            if not os.path.exists(target):
+                source = os.path.join(self.cache_path, rom_name, cache_folder, f"{rom_name}.png")
+                if not os.path.exists(source):
+                    continue
+                os.makedirs(self.media_path, exist_ok=True)
+                shutil.copyfile(source, target)
+            media[tag] = f"./{MEDIA_FOLDER}/{filename}"
+        return media
+
+    def get_values(self, rom_name, catalog, store):
+        """Campi del gamelist di una ROM dai dati disponibili (catalogo, informazioni salvate, file locali)"""
+        row = catalog.get_row(rom_name) if catalog is not None else None
+        info = store.get(rom_name) or {}
+        if row is None and not info:
+            return {}
+
+        values = {}
+        name = catalog.descriptions[row] if row is not None else info.get('name')
+        year = catalog.years[row] if row is not None else info.get('year')
+        manufacturer = catalog.manufacturers[row] if row is not None else info.get('manufacturer')
+        description = info.get('description')
+        if not description and self.history is not None:
+            description = self.history.get_description(rom_name)
+        if name:
+            values['name'] = name
+        if description:
+            values['desc'] = description
+        release_date = format_release_date(year)
+        if release_date:
+            values['releasedate'] = release_date
+        if manufacturer and manufacturer != "N/A":
+            values['developer'] = manufacturer
+        values.update(self.get_media(rom_name))
+        return values
+
+    def export(self):
+        """Aggiorna il gamelist.xml, ritorna il numero di campi aggiunti"""
+        if not os.path.isdir(self.roms_path):
+            return 0
+        root = self.load_gamelist()
+        if root is None:
+            return 0
+
+        # Snapshot dell'ultima compilazione, anche se il DAT è cambiato nel frattempo
+        catalog = GameCatalog.load_snapshot(get_snapshot_path(self.cache_path))
+        store = GameInfoStore(self.cache_path)
+        entries = {}
+        for game in root.findall('game'):
+            path = (game.findtext('path') or "").strip()
+            if path:
+                entries[os.path.basename(path)] = game
+
+        changed = 0
+        with os.scandir(self.roms_path) as folder:
+            filenames = sorted(entry.name for entry in folder
+                               if get_rom_name(entry.name) is not None and entry.is_file())
+        for filename in filenames:
+            values = self.get_values(get_rom_name(filename), catalog, store)
+            if not values:
+                continue
+            game = entries.get(filename)
+            if game is None:
+                game = ET.SubElement(root, 'game')
+                ET.SubElement(game, 'path').text = f"./{filename}"
+                entries[filename] = game
+            for tag, value in values.items():
+                element = game.find(tag)
+                if element is None:
+                    element = ET.SubElement(game, tag)
+                elif (element.text or "").strip():
+                    continue
+                element.text = value
+                changed += 1
+
+        if changed:
+            if hasattr(ET, 'indent'):
+                ET.indent(root, space="\t")
+            tmp_path = f"{self.gamelist_path}.{os.getpid()}.tmp"
+            ET.ElementTree(root).write(tmp_path, encoding='utf-8', xml_declaration=True)
+            os.replace(tmp_path, self.gamelist_path)
+        logger.info(f"Gamelist {self.gamelist_path}: {len(filenames)} ROM, {changed} campi aggiunti")
+        return changed
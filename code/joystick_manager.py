@@ -293,7 +293,7 @@ class JoystickManager:
         elif button == config['start']:  # Start
             return None  # Start gestito per uscita applicazione
         elif button == config['select']:  # Select
-            return None  # Select non utilizzato attualmente
+            return 'toggle_clones'  # Espande/chiude i cloni del gioco selezionato
         
         self.last_input_time = current_time
         return None
@@ -7,28 +7,148 @@ Gestore per le piattaforme caricate dal file XML.
 """
 
 import os
+import time
+import marshal
 import xml.etree.ElementTree as ET
 import logging
 from io import StringIO
 
+from code.game_catalog import get_snapshot_path, read_snapshot_header
+
 logger = logging.getLogger('LRscript')
 
+# Campi di una piattaforma: chiave del record, tag XML e valore di default
+PLATFORM_FIELDS = (
+    ('name', 'name', "Piattaforma Sconosciuta"),
+    ('path', 'cache_path', "./cache/default"),
+    ('roms_path', 'roms_path', "/userdata/roms/default"),
+    ('xml', 'xml', ""),
+    ('ingame', 'ingame', ""),
+    ('title', 'title', ""),
+    ('info', 'info', ""),
+    ('rom', 'rom', ""),
+    ('image', 'image', ""),
+    ('catver', 'catver', "")
+)
+PLATFORM_KEYS = tuple(key for key, tag, default in PLATFORM_FIELDS)
+
+# Registro delle piattaforme già letto da platforms.xml, riusato finché il file non cambia
+REGISTRY_CACHE_PATH = "./cache/platforms.registry"
+REGISTRY_VERSION = 1
+
+# Cartella dei loghi delle piattaforme
+LOGOS_PATH = "./resources/logos"
+
+# Secondi tra due tentativi di leggere il numero di giochi di uno snapshot non ancora compilato
+GAME_COUNT_RETRY = 5.0
+
+
+class PlatformRecord:
+    """Piattaforma letta da platforms.xml, accessibile come un dizionario.
+
+    I campi sono in slot (niente dizionario per istanza); i dati derivati
+    (percorsi risolti, URL, numero giochi, logo) si calcolano al primo uso.
+    """
+
+    __slots__ = PLATFORM_KEYS + ('_snapshot_path', '_game_count', '_game_count_time')
+
+    def __init__(self, values):
+        for key, value in zip(PLATFORM_KEYS, values):
+            setattr(self, key, value)
+        self._snapshot_path = None
+        self._game_count = None
+        self._game_count_time = 0.0
+
+    def __getitem__(self, key):
+        if key not in PLATFORM_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in PLATFORM_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in PLATFORM_KEYS
+
+    def get(self, key, default=None):
+        """Come dict.get"""
+        return getattr(self, key) if key in PLATFORM_KEYS else default
+
+    def keys(self):
+        """Chiavi dei campi, come dict.keys"""
+        return PLATFORM_KEYS
+
+    def to_tuple(self):
+        """Valori dei campi nell'ordine di PLATFORM_KEYS (per il registro su disco)"""
+        return tuple(getattr(self, key) for key in PLATFORM_KEYS)
+
+    @property
+    def snapshot_path(self):
+        """Percorso dello snapshot del catalogo della piattaforma"""
+        if self._snapshot_path is None:
+            self._snapshot_path = get_snapshot_path(self.path)
+        return self._snapshot_path
+
+    @property
+    def logo_path(self):
+        """Percorso del logo personalizzato, stringa vuota se non impostato"""
+        return os.path.join(LOGOS_PATH, self.image) if self.image else ''
+
+    def get_url(self, key, rom_name):
+        """URL di un template della piattaforma (ingame, title, info) per una ROM"""
+        return getattr(self, key).replace('{rom_name}', rom_name)
+
+    def get_game_count(self):
+        """Numero di giochi letto dall'header dello snapshot, None se non ancora compilato.
+
+        Il valore si legge una sola volta; se lo snapshot manca si riprova al
+        massimo ogni GAME_COUNT_RETRY secondi (il precaricamento lo sta compilando).
+        """
+        if self._game_count is None:
+            now = time.time()
+            if now - self._game_count_time >= GAME_COUNT_RETRY:
+                self._game_count_time = now
+                header = read_snapshot_header(self.snapshot_path)
+                if header is not None:
+                    self._game_count = header[1]
+        return self._game_count
+
+    def invalidate(self):
+        """Dimentica i dati derivati (es. snapshot ricompilato)"""
+        self._game_count = None
+        self._game_count_time = 0.0
+
+
+def get_registry_key(xml_file):
+    """Impronta di platforms.xml usata per validare il registro su disco"""
+    stat = os.stat(xml_file)
+    return (os.path.abspath(xml_file), stat.st_size, stat.st_mtime_ns)
+
+
 class PlatformManager:
     """Gestore per le piattaforme caricate dal file XML"""
     
-    def __init__(self, xml_file="platforms.xml"):
+    def __init__(self, xml_file="platforms.xml", registry_path=REGISTRY_CACHE_PATH):
         self.xml_file = xml_file
+        self.registry_path = registry_path
         self.platforms = []
         self.load_platforms()
     
     def load_platforms(self):
-        """Carica le piattaforme dal file XML"""
+        """Carica le piattaforme dal registro su disco o, se assente/obsoleto, dal file XML"""
         try:
             if not os.path.exists(self.xml_file):
                 logger.warning(f"File {self.xml_file} non trovato, creo piattaforme di default")
                 self.create_default_platforms()
                 return
             
+            registry_key = get_registry_key(self.xml_file)
+            if self.load_registry(registry_key):
+                logger.info(f"Caricate {len(self.platforms)} piattaforme dal registro {self.registry_path}")
+                return
+            
             # Prova prima con il parser normale
             try:
                 tree = ET.parse(self.xml_file)
@@ -52,29 +172,59 @@ class PlatformManager:
             self.program_version = version_element.text if version_element is not None else "0.0.0"
             logger.info(f"Versione programma: {self.program_version}")
             
-            self.platforms = []
-            for platform in root.findall('platform'):
-                platform_data = {
-                    'name': platform.find('name').text if platform.find('name') is not None else "Piattaforma Sconosciuta",
-                    'path': platform.find('cache_path').text if platform.find('cache_path') is not None else "./cache/default",
-                    'roms_path': platform.find('roms_path').text if platform.find('roms_path') is not None else "/userdata/roms/default",
-                    'xml': platform.find('xml').text if platform.find('xml') is not None else "",
-                    'ingame': platform.find('ingame').text if platform.find('ingame') is not None else "",
-                    'title': platform.find('title').text if platform.find('title') is not None else "",
-                    'info': platform.find('info').text if platform.find('info') is not None else "",
-                    'rom': platform.find('rom').text if platform.find('rom') is not None else "",
-                    'image': platform.find('image').text if platform.find('image') is not None else ""
-                }
-                self.platforms.append(platform_data)
+            self.platforms = [self.parse_platform(platform) for platform in root.findall('platform')]
             
             logger.info(f"Caricate {len(self.platforms)} piattaforme dal file XML")
             for i, platform in enumerate(self.platforms):
                 logger.debug(f"Piattaforma {i+1}: {platform['name']}")
+            self.save_registry(registry_key)
                 
         except Exception as e:
             logger.error(f"Errore caricamento piattaforme: {e}")
             self.create_default_platforms()
     
+    def parse_platform(self, element):
+        """Crea il record di un elemento <platform> leggendo i figli una sola volta"""
+        texts = {}
+        for child in element:
+            texts.setdefault(child.tag, child.text)
+        values = []
+        for key, tag, default in PLATFORM_FIELDS:
+            # Come prima: tag assente -> default, tag vuoto -> None
+            values.append(texts[tag] if tag in texts else default)
+        return PlatformRecord(values)
+    
+    def load_registry(self, registry_key):
+        """Carica il registro salvato se è stato compilato da questo platforms.xml"""
+        try:
+            with open(self.registry_path, 'rb') as f:
+                version, stored_key, program_version, platforms = marshal.load(f)
+        except (OSError, ValueError, EOFError, TypeError):
+            return False
+        if version != REGISTRY_VERSION or tuple(stored_key) != registry_key:
+            return False
+        self.program_version = program_version
+        logger.info(f"Versione programma: {self.program_version}")
+        self.platforms = [PlatformRecord(values) for values in platforms]
+        return True
+    
+    def save_registry(self, registry_key=None):
+        """Salva il registro delle piattaforme per i prossimi avvii"""
+        try:
+            if registry_key is None:
+                registry_key = get_registry_key(self.xml_file)
+            folder = os.path.dirname(self.registry_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            data = (REGISTRY_VERSION, registry_key, self.get_program_version(),
+                    tuple(platform.to_tuple() for platform in self.platforms))
+            tmp_path = f"{self.registry_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(data, f)
+            os.replace(tmp_path, self.registry_path)
+        except Exception as e:
+            logger.warning(f"Errore salvataggio registro piattaforme: {e}")
+    
     def create_default_platforms(self):
         """Crea piattaforme di default se il file XML non esiste o è corrotto"""
         # Imposta versione di default
@@ -82,17 +232,18 @@ class PlatformManager:
         logger.info(f"Versione programma (default): {self.program_version}")
         
         self.platforms = [
-            {
-                'name': 'MAME_2003-Plus',
-                'path': './cache/MAME_2003-Plus',
-                'roms_path': '/userdata/roms/mame078plus',
-                'xml': './xml/mame2003-plus.xml',
-                'ingame': 'adb.arcadeitalia.net/?mame={rom_name}&type=ingame&resize=0',
-                'title': 'adb.arcadeitalia.net/?mame={rom_name}&type=title&resize=0',
-                'info': 'adb.arcadeitalia.net/service_scraper.php?ajax=query_mame&game_name={rom_name}&lang=it',
-                'rom': 'https://archive.org/download/MAME_2003-Plus_Reference/roms/',
-                'image': ''
-            }
+            PlatformRecord((
+                'MAME_2003-Plus',
+                './cache/MAME_2003-Plus',
+                '/userdata/roms/mame078plus',
+                './xml/mame2003-plus.xml',
+                'adb.arcadeitalia.net/?mame={rom_name}&type=ingame&resize=0',
+                'adb.arcadeitalia.net/?mame={rom_name}&type=title&resize=0',
+                'adb.arcadeitalia.net/service_scraper.php?ajax=query_mame&game_name={rom_name}&lang=it',
+                'https://archive.org/download/MAME_2003-Plus_Reference/roms/',
+                '',
+                ''
+            ))
         ]
         logger.info(f"Create {len(self.platforms)} piattaforme di default")
     
@@ -110,6 +261,11 @@ class PlatformManager:
         """Restituisce il numero di piattaforme"""
         return len(self.platforms)
     
+    def invalidate_derived(self):
+        """Dimentica i dati derivati di tutte le piattaforme (es. dopo il precaricamento)"""
+        for platform in self.platforms:
+            platform.invalidate()
+    
     def save_platform_image(self, platform_name, image_filename):
         """Salva l'immagine personalizzata per una piattaforma nel file XML"""
         try:
@@ -159,6 +315,8 @@ class PlatformManager:
                 
                 # Salva il file con formattazione corretta
                 self._write_xml_with_formatting(tree, self.xml_file)
+                # Il file è cambiato: il registro va riallineato alla nuova impronta
+                self.save_registry()
                 logger.info(f"Immagine {image_filename} salvata per {platform_name}")
                 return True
             else:
@@ -169,13 +327,6 @@ class PlatformManager:
             logger.error(f"Errore salvataggio immagine per {platform_name}: {e}")
             return False
 
-    def get_platform_image(self, platform_name):
-        """Ottiene il nome del file immagine per una piattaforma"""
-        for platform in self.platforms:
-            if platform['name'] == platform_name:
-                return platform.get('image', '')
-        return ''
-    
     def _write_xml_with_formatting(self, tree, filename):
         """Scrive il file XML con formattazione corretta"""
         try:
@@ -10,6 +10,8 @@ import os
 import time
 import pygame
 import logging
+
+from code.platform_manager import LOGOS_PATH
 # Importa le costanti dal file principale
 import sys
 import os
@@ -87,7 +89,7 @@ class PlatformMenu:
     def load_available_images(self):
         """Carica le immagini disponibili dalla cartella resources/logos"""
         self.available_images = []
-        logos_path = "./resources/logos"
+        logos_path = LOGOS_PATH
         
         # Crea la cartella se non esiste
         if not os.path.exists(logos_path):
@@ -270,13 +272,13 @@ class PlatformMenu:
         
         self.close_image_menu()
 
-    def get_platform_image(self, platform_name):
+    def get_platform_image(self, platform):
         """Ottiene l'immagine personalizzata per una piattaforma"""
-        image_filename = self.platform_manager.get_platform_image(platform_name)
-        if image_filename:
+        logo_path = platform.logo_path
+        if logo_path:
             # Trova l'immagine nella lista delle immagini disponibili
             for img_info in self.available_images:
-                if img_info['filename'] == image_filename:
+                if img_info['path'] == logo_path:
                     return img_info['image']
         return None
 
@@ -373,7 +375,7 @@ class PlatformMenu:
                     continue
                 
                 # Disegna immagine personalizzata se disponibile - LAYOUT VERTICALE
-                platform_image = self.get_platform_image(platform['name'])
+                platform_image = self.get_platform_image(platform)
                 if platform_image:
                     # Calcola l'area per l'immagine (parte superiore del pulsante)
                     # L'immagine occupa il 70% dell'altezza, il testo il 30%
@@ -437,6 +439,13 @@ class PlatformMenu:
                     text_rect = text_surface.get_rect(center=(text_x, text_y))
                 
                 screen.blit(text_surface, text_rect)
+                
+                # Numero di giochi dallo snapshot, solo se già compilato
+                game_count = platform.get_game_count()
+                if game_count is not None:
+                    count_surface = self.font_tiny.render(f"{game_count} giochi", True, self.colors['text_secondary'])
+                    count_rect = count_surface.get_rect(bottomright=(x + self.platform_width - 6, y + self.platform_height - 4))
+                    screen.blit(count_surface, count_rect)
         
         # Disegna scrollbar se necessaria
         if self.scroll_enabled:
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Process Pool
+=======================
+Regole comuni dei pool di processi in background (precaricamento cataloghi,
+verifica ROM): un core resta libero e i processi hanno priorità più bassa,
+così il loop pygame mantiene i 60 FPS.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Priorità (nice) dei processi in background rispetto al processo pygame
+BACKGROUND_NICENESS = 10
+
+
+def get_background_workers(max_workers=0):
+    """Processi di un pool in background: di default tutti i core meno uno, riservato al loop pygame"""
+    if max_workers > 0:
+        return max_workers
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def lower_priority(niceness=BACKGROUND_NICENESS):
+    """Abbassa la priorità del processo corrente (initializer dei processi del pool)"""
+    if niceness and hasattr(os, 'nice'):
+        os.nice(niceness)
+
+
+def get_mp_context():
+    """Contesto multiprocessing: fork evita di rieseguire __main__ nei processi figli, None se non disponibile"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def create_background_pool(max_workers, mp_context, niceness=BACKGROUND_NICENESS):
+    """Pool di processi a priorità ridotta.
+
+    I processi nascono con fork da un thread del processo pygame: eseguono
+    solo la funzione inviata e non usano le connessioni sqlite, i file in
+    mmap o il display ereditati dal padre. Tutti i pool dell'applicazione
+    passano da qui, così la scelta del metodo di avvio resta in un solo punto.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                               initializer=lower_priority, initargs=(niceness,))
+
+
+def terminate_pool(executor):
+    """Chiude il pool senza attendere: annulla i job in coda e termina i processi ancora attivi.
+
+    Con il solo shutdown(wait=False) l'uscita dell'interprete aspetterebbe
+    comunque la fine dei job già avviati.
+    """
+    # shutdown() azzera _processes: i processi si leggono prima
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
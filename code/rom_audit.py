@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - ROM Audit
+====================
+Verifica delle ROM presenti nella cartella roms_path di una piattaforma
+rispetto ai CRC del DAT. Di ogni zip si legge solo la directory centrale
+(nessuna decompressione); gli zip sono distribuiti su un pool di processi
+(a priorità ridotta, come il precaricamento dei cataloghi) e i CRC letti
+restano in cache finché il file non cambia.
+"""
+
+import os
+import time
+import marshal
+import zipfile
+import threading
+import logging
+
+from code.rom_index import get_rom_name
+from code.process_pool import create_background_pool, get_background_workers, get_mp_context
+
+logger = logging.getLogger('LRscript')
+
+# Versione del formato della cache su disco
+AUDIT_CACHE_VERSION = 1
+AUDIT_EXTENSION = ".audit"
+
+# Zip letti da ogni job del pool (pochi job grandi: meno comunicazione tra processi)
+AUDIT_BATCH_SIZE = 128
+
+# Esiti della verifica, nell'ordine del riepilogo
+AUDIT_STATUSES = ('complete', 'incomplete', 'wrong', 'unknown', 'unreadable')
+AUDIT_LABELS = {
+    'complete': "complete",
+    'incomplete': "incomplete",
+    'wrong': "set errato",
+    'unknown': "non nel DAT",
+    'unreadable': "illeggibili",
+}
+
+
+def get_audit_path(cache_path):
+    """Percorso della cache della verifica accanto alla cartella cache della piattaforma"""
+    return os.path.normpath(cache_path) + AUDIT_EXTENSION
+
+
+def read_zip_crcs(path):
+    """CRC32 dei file di uno zip letti dalla directory centrale, None se lo zip non è leggibile"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return tuple(info.CRC for info in archive.infolist() if not info.is_dir())
+    except (OSError, zipfile.BadZipFile, ValueError):
+        return None
+
+
+def read_zip_batch(paths):
+    """CRC di un blocco di zip (eseguita in un processo del pool)"""
+    return [read_zip_crcs(path) for path in paths]
+
+
+def check_game(catalog, row, zip_crcs):
+    """Esito della verifica di uno zip rispetto al gioco del DAT con lo stesso nome.
+
+    Le ROM mancanti presenti anche nel parent non contano (set split: stanno
+    nello zip del parent). Uno zip senza nessuno dei CRC attesi è di un
+    altro set o di un'altra versione del gioco.
+    """
+    expected = set(catalog.get_crcs(row))
+    if not expected:
+        return 'complete'
+    missing = expected.difference(zip_crcs)
+    if not missing:
+        return 'complete'
+    if len(missing) == len(expected):
+        return 'wrong'
+    parent_row = catalog.get_row(catalog.parents[row])
+    if parent_row is not None and missing.issubset(catalog.get_crcs(parent_row)):
+        return 'complete'
+    return 'incomplete'
+
+
+class RomAudit:
+    """Verifica in background degli zip di roms_path con i CRC del catalogo.
+
+    results associa a ogni esito la lista ordinata dei nomi ROM; progress e
+    total permettono di mostrare l'avanzamento dal loop pygame.
+    """
+
+    def __init__(self, roms_path, cache_path, catalog, max_workers=0):
+        self.roms_path = roms_path
+        self.audit_path = get_audit_path(cache_path)
+        self.catalog = catalog
+        # Come il precaricamento: di default resta libero un core per il loop pygame
+        self.max_workers = get_background_workers(max_workers)
+        self.results = {status: [] for status in AUDIT_STATUSES}
+        self.state = 'idle'  # 'idle', 'running', 'done', 'error'
+        self.error_message = ""
+        self.progress = 0
+        self.total = 0
+        self.elapsed = 0.0
+        self.thread = None
+
+    def start(self):
+        """Avvia la verifica in un thread separato"""
+        self.state = 'running'
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def summary(self):
+        """Riepilogo breve degli esiti (es. per un toast)"""
+        parts = [f"{len(self.results[status])} {AUDIT_LABELS[status]}"
+                 for status in AUDIT_STATUSES if self.results[status]]
+        return ", ".join(parts) or "nessuna ROM"
+
+    def scan_folder(self):
+        """File ROM della cartella con dimensione e data di modifica: nome file -> (dimensione, mtime)"""
+        files = {}
+        with os.scandir(self.roms_path) as entries:
+            for entry in entries:
+                if get_rom_name(entry.name) is None or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def load_cache(self):
+        """CRC già letti nelle verifiche precedenti: nome file -> (dimensione, mtime, CRC)"""
+        try:
+            with open(self.audit_path, 'rb') as f:
+                version, roms_path, entries = marshal.load(f)
+        except (OSError, ValueError, EOFError, TypeError):
+            return {}
+        if version != AUDIT_CACHE_VERSION or roms_path != os.path.abspath(self.roms_path):
+            return {}
+        return entries
+
+    def save_cache(self, entries):
+        """Salva i CRC letti per le prossime verifiche"""
+        try:
+            folder = os.path.dirname(self.audit_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp_path = f"{self.audit_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump((AUDIT_CACHE_VERSION, os.path.abspath(self.roms_path), entries), f)
+            os.replace(tmp_path, self.audit_path)
+        except Exception as e:
+            logger.warning(f"Errore salvataggio verifica ROM {self.audit_path}: {e}")
+
+    def read_changed(self, names):
+        """Legge la directory centrale degli zip indicati: nome file -> CRC (None se illeggibile)"""
+        paths = [os.path.join(self.roms_path, name) for name in names]
+        batches = [paths[start:start + AUDIT_BATCH_SIZE] for start in range(0, len(paths), AUDIT_BATCH_SIZE)]
+        workers = min(self.max_workers, len(batches))
+        mp_context = get_mp_context() if workers > 1 else None
+
+        crcs = []
+        if mp_context is None:
+            for batch in batches:
+                crcs.extend(read_zip_batch(batch))
+                self.progress += len(batch)
+        else:
+            with create_background_pool(workers, mp_context) as executor:
+                # map mantiene l'ordine dei blocchi
+                for batch, batch_crcs in zip(batches, executor.map(read_zip_batch, batches)):
+                    crcs.extend(batch_crcs)
+                    self.progress += len(batch)
+        return dict(zip(names, crcs))
+
+    def _worker(self):
+        """Rilegge solo gli zip nuovi o modificati, poi confronta tutti con il catalogo"""
+        start_time = time.time()
+        try:
+            files = self.scan_folder()
+            cache = self.load_cache()
+            entries = {}
+            changed = []
+            for name, (size, mtime) in files.items():
+                cached = cache.get(name)
+                if cached is not None and cached[0] == size and cached[1] == mtime:
+                    entries[name] = cached
+                elif name.lower().endswith('.zip'):
+                    changed.append(name)
+                else:
+                    # Solo gli zip hanno una directory centrale leggibile senza librerie esterne
+                    entries[name] = (size, mtime, None)
+            self.total = len(changed)
+
+            for name, crcs in self.read_changed(changed).items():
+                size, mtime = files[name]
+                entries[name] = (size, mtime, crcs)
+            self.save_cache(entries)
+
+            results = {status: [] for status in AUDIT_STATUSES}
+            for name in sorted(entries):
+                rom_name = get_rom_name(name)
+                crcs = entries[name][2]
+                row = self.catalog.get_row(rom_name)
+                if row is None:
+                    status = 'unknown'
+                elif crcs is None:
+                    status = 'unreadable'
+                else:
+                    status = check_game(self.catalog, row, crcs)
+                results[status].append(rom_name)
+            self.results = results
+
+            self.elapsed = time.time() - start_time
+            logger.info(f"Verifica ROM di {self.roms_path}: {len(entries)} file, {len(changed)} riletti "
+                        f"in {self.elapsed:.1f}s - {self.summary()}")
+            for status in AUDIT_STATUSES[1:]:
+                if results[status]:
+                    logger.info(f"ROM {AUDIT_LABELS[status]}: {', '.join(results[status])}")
+            self.state = 'done'
+        except Exception as e:
+            logger.error(f"Errore verifica ROM {self.roms_path}: {e}")
+            self.error_message = str(e)
+            self.state = 'error'
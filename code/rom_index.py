@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Installed ROM Index
+==============================
+Insieme delle ROM già presenti nella cartella roms_path di una piattaforma,
+tenuto aggiornato con inotify (Linux) o, in mancanza, con un controllo
+periodico della cartella.
+"""
+
+import os
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+import threading
+import logging
+
+logger = logging.getLogger('LRscript')
+
+# Estensioni dei file ROM riconosciuti come giochi installati
+ROM_EXTENSIONS = ('.zip', '.7z')
+
+# Secondi tra due controlli della cartella quando inotify non è disponibile
+POLL_INTERVAL = 5.0
+
+# Costanti inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, lunghezza nome
+
+# File aggiunti solo a scrittura terminata: un download in corso non risulta installato
+ADDED_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+REMOVED_MASK = IN_DELETE | IN_MOVED_FROM
+WATCH_MASK = ADDED_MASK | REMOVED_MASK | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+def get_rom_name(filename):
+    """Nome ROM di un file della cartella (senza estensione), None se non è una ROM"""
+    stem, extension = os.path.splitext(filename)
+    if extension.lower() in ROM_EXTENSIONS:
+        return stem
+    return None
+
+
+def _load_libc():
+    """libc con inotify tramite ctypes, None se non disponibile (es. non Linux)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class InstalledRomIndex:
+    """Nomi delle ROM presenti in una cartella, letti con una sola scansione.
+
+    La scansione iniziale e la sorveglianza della cartella girano in un
+    thread: il loop pygame interroga solo l'insieme in memoria (nessun
+    os.path.exists per riga). version cresce a ogni modifica dell'insieme.
+    """
+
+    def __init__(self, roms_path, poll_interval=POLL_INTERVAL):
+        self.roms_path = roms_path
+        self.poll_interval = poll_interval
+        self.installed = set()
+        self.version = 0
+        self.ready = False
+        self.stopped = False
+        self.thread = None
+
+    def __contains__(self, rom_name):
+        return rom_name in self.installed
+
+    def __len__(self):
+        return len(self.installed)
+
+    def start(self):
+        """Avvia scansione e sorveglianza in un thread separato"""
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Ferma la sorveglianza (cambio piattaforma o chiusura)"""
+        self.stopped = True
+
+    def mark_installed(self, rom_name):
+        """Registra subito una ROM appena scaricata (senza attendere il prossimo controllo)"""
+        if rom_name not in self.installed:
+            self.installed.add(rom_name)
+            self.version += 1
+
+    def scan(self):
+        """Legge la cartella con un solo os.scandir e sostituisce l'insieme"""
+        installed = set()
+        try:
+            with os.scandir(self.roms_path) as entries:
+                for entry in entries:
+                    rom_name = get_rom_name(entry.name)
+                    if rom_name is not None and entry.is_file():
+                        installed.add(rom_name)
+        except OSError as e:
+            logger.debug(f"Cartella ROM non leggibile {self.roms_path}: {e}")
+        self.installed = installed
+        self.version += 1
+        self.ready = True
+
+    def _get_mtime(self):
+        """Data di modifica della cartella (cambia quando si aggiunge o rimuove un file)"""
+        try:
+            return os.stat(self.roms_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _worker(self):
+        """Scansione iniziale, poi inotify se disponibile, altrimenti polling"""
+        mtime = self._get_mtime()
+        self.scan()
+        logger.info(f"ROM installate in {self.roms_path}: {len(self.installed)}")
+        if mtime is not None and self._watch_inotify():
+            return
+        self._watch_polling(mtime)
+
+    def _watch_inotify(self):
+        """Applica all'insieme gli eventi inotify della cartella.
+
+        Ritorna True se la sorveglianza è terminata normalmente, False se
+        inotify non è utilizzabile (si passa al polling).
+        """
+        libc = _load_libc()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return False
+        try:
+            if libc.inotify_add_watch(fd, os.fsencode(self.roms_path), WATCH_MASK) < 0:
+                logger.info(f"inotify non disponibile per {self.roms_path}, uso il polling")
+                return False
+            logger.debug(f"Sorveglianza inotify di {self.roms_path}")
+            while not self.stopped:
+                # Timeout per accorgersi di stop() anche senza eventi
+                readable, _, _ = select.select([fd], [], [], 1.0)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not self._apply_events(data):
+                    # Cartella rimossa o spostata: continua con il polling
+                    return False
+            return True
+        finally:
+            os.close(fd)
+
+    def _apply_events(self, data):
+        """Aggiorna l'insieme con un blocco di eventi inotify, False se la cartella non è più sorvegliata"""
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Eventi persi: una nuova scansione rimette in pari l'insieme
+                self.scan()
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                return False
+            rom_name = get_rom_name(os.fsdecode(name))
+            if rom_name is None:
+                continue
+            if mask & ADDED_MASK:
+                self.mark_installed(rom_name)
+            elif mask & REMOVED_MASK and rom_name in self.installed:
+                self.installed.discard(rom_name)
+                self.version += 1
+        return True
+
+    def _watch_polling(self, mtime):
+        """Riscansiona la cartella solo quando cambia la sua data di modifica"""
+        logger.debug(f"Sorveglianza con polling di {self.roms_path} ogni {self.poll_interval}s")
+        while not self.stopped:
+            time.sleep(self.poll_interval)
+            current = self._get_mtime()
+            if current != mtime:
+                mtime = current
+                self.scan()
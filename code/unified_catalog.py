@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRscript - Unified Catalog
+==========================
+Catalogo unico di tutte le piattaforme con i giochi in comune riconosciuti
+per nome ROM o per insieme di CRC delle ROM, mostrato come lista unica con
+le piattaforme di ogni gioco.
+"""
+
+import os
+import time
+import logging
+from array import array
+
+from code.game_catalog import GameCatalog, get_dat_fingerprint, get_snapshot_path
+
+logger = logging.getLogger('LRscript')
+
+# Snapshot del catalogo unificato, accanto a quelli delle piattaforme
+UNIFIED_CACHE_PATH = "./cache/unified"
+
+# Le piattaforme di un gioco sono i bit di un intero a 64 bit
+MAX_UNIFIED_PLATFORMS = 64
+
+# Ordinamento della lista unificata: i nomi ROM cambiano tra le piattaforme, i titoli no
+UNIFIED_SORT_ORDER = 'description'
+
+
+def get_crc_signature(crcs):
+    """Firma di un insieme di CRC: uguale per set di ROM identici con nomi diversi, None se vuoto.
+
+    È la tupla ordinata dei CRC, non un suo hash: due set diversi con hash
+    uguale resterebbero altrimenti uniti in un solo gioco.
+    """
+    if not crcs:
+        return None
+    return tuple(sorted(set(crcs)))
+
+
+def load_platform_catalog(platform):
+    """Catalogo di una piattaforma dal suo snapshot: il DAT si rilegge solo se lo snapshot manca o è obsoleto"""
+    xml_path = platform['xml']
+    catalog = GameCatalog.load_snapshot(get_snapshot_path(platform['path']), get_dat_fingerprint(xml_path))
+    if catalog is None:
+        logger.info(f"Catalogo unificato: snapshot di {platform['name']} non aggiornato, lettura del DAT")
+        catalog = GameCatalog.from_dat(xml_path)
+    return catalog
+
+
+def get_unified_fingerprint(platforms):
+    """Impronta del catalogo unificato: nome e impronta del DAT di ogni piattaforma, nell'ordine"""
+    fingerprint = []
+    for platform in platforms[:MAX_UNIFIED_PLATFORMS]:
+        xml_path = platform.get('xml')
+        dat_fingerprint = get_dat_fingerprint(xml_path) if xml_path and os.path.exists(xml_path) else None
+        fingerprint.append((platform['name'], dat_fingerprint))
+    return tuple(fingerprint)
+
+
+class UnifiedCatalog(GameCatalog):
+    """Catalogo con una riga per gioco e la maschera delle piattaforme che lo contengono.
+
+    Un gioco di una nuova piattaforma si unisce a una riga esistente se ha
+    lo stesso nome ROM oppure lo stesso insieme di CRC (stesso set con nome
+    diverso, es. tra FBNeo e MAME): in quel caso il suo nome è registrato
+    come alias della riga per quella piattaforma.
+    """
+
+    COLUMNS = GameCatalog.COLUMNS + ('platform_masks', 'aliases')
+    ARRAY_COLUMNS = dict(GameCatalog.ARRAY_COLUMNS, platform_masks='Q')
+
+    def __init__(self, fingerprint=None):
+        super().__init__(fingerprint)
+        self.platform_masks = array('Q')  # bit i = gioco presente nella piattaforma i
+        self.aliases = []       # Per riga: tupla di (indice piattaforma, nome ROM) con nome diverso
+        self.alias_index = {}   # (indice piattaforma, nome ROM) -> riga
+        self._crc_index = {}    # Firma CRC -> riga, usato solo durante la costruzione
+
+    def build_index(self):
+        """Ricostruisce gli indici per nome ROM e per alias"""
+        super().build_index()
+        self.alias_index = {alias: row for row, aliases in enumerate(self.aliases) for alias in aliases}
+
+    def add_platform_game(self, platform_index, game):
+        """Aggiunge un gioco letto dal DAT di una piattaforma, unendolo a quello già presente"""
+        signature = get_crc_signature(game['crcs'])
+        row = self.index.get(game['name'])
+        if row is None and signature is not None:
+            row = self._crc_index.get(signature)
+            # Set identici nella stessa piattaforma restano giochi distinti
+            if row is not None and self.platform_masks[row] >> platform_index & 1:
+                row = None
+            if row is not None:
+                alias = (platform_index, game['name'])
+                self.aliases[row] += (alias,)
+                self.alias_index[alias] = row
+        if row is None:
+            row = len(self)
+            self.add_game(game)
+            self.platform_masks.append(0)
+            self.aliases.append(())
+        if signature is not None:
+            self._crc_index.setdefault(signature, row)
+        self.platform_masks[row] |= 1 << platform_index
+
+    def find_row(self, platform_index, rom_name):
+        """Riga del gioco con questo nome ROM nella piattaforma indicata, None se assente"""
+        row = self.alias_index.get((platform_index, rom_name))
+        if row is None:
+            row = self.index.get(rom_name)
+        return row
+
+    def get_platform_indexes(self, row):
+        """Indici delle piattaforme che contengono il gioco"""
+        mask = self.platform_masks[row]
+        return [index for index in range(MAX_UNIFIED_PLATFORMS) if mask >> index & 1]
+
+    def get_platform_rom_name(self, row, platform_index):
+        """Nome ROM del gioco nella piattaforma indicata (l'alias, se lì ha un nome diverso)"""
+        for index, rom_name in self.aliases[row]:
+            if index == platform_index:
+                return rom_name
+        return self.names[row]
+
+    @classmethod
+    def from_platforms(cls, platforms):
+        """Costruisce il catalogo unendo gli snapshot delle piattaforme, uno alla volta"""
+        catalog = cls(get_unified_fingerprint(platforms))
+        for platform_index, platform in enumerate(platforms[:MAX_UNIFIED_PLATFORMS]):
+            xml_path = platform.get('xml')
+            if not xml_path or not os.path.exists(xml_path):
+                continue
+            platform_catalog = load_platform_catalog(platform)
+            for row in range(len(platform_catalog)):
+                catalog.add_platform_game(platform_index, platform_catalog.get_record(row))
+            logger.info(f"Catalogo unificato: {platform['name']} letto, {len(catalog)} giochi distinti")
+        catalog._crc_index = {}
+        return catalog
+
+
+def compile_unified_catalog(platforms):
+    """Compila lo snapshot del catalogo unificato (in un processo del precaricamento o nel thread di caricamento)"""
+    start_time = time.time()
+    catalog = UnifiedCatalog.from_platforms(platforms)
+    catalog.save_snapshot(get_snapshot_path(UNIFIED_CACHE_PATH))
+    return len(catalog), time.time() - start_time
+
+
+def load_unified_catalog(platforms):
+    """Carica lo snapshot del catalogo unificato se aggiornato, altrimenti None"""
+    return UnifiedCatalog.load_snapshot(get_snapshot_path(UNIFIED_CACHE_PATH), get_unified_fingerprint(platforms))